@@ -0,0 +1,62 @@
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import USER_CLAIMS, current_token_version
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Authenticate from the token claims alone.
+
+    The user is built from the claims set by ``UserRefreshToken`` with every
+    other field deferred, so views that only need ``request.user.id`` or
+    ``is_staff`` cost no user query while anything else (email, name, image)
+    is loaded from the database on first access. Tokens issued before the
+    claims existed fall back to the regular database lookup.
+
+    Revocation is checked against the user's current ``token_version``,
+    cached for ``TOKEN_VERSION_CACHE_TIMEOUT`` seconds and read from the
+    database on a miss.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+
+        model = self.user_model
+        try:
+            user_id = model._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        current_version = current_token_version(model, user_id)
+        if current_version is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if validated_token["token_version"] < current_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        loaded = {api_settings.USER_ID_FIELD: user_id}
+        loaded.update((claim, validated_token[claim]) for claim in USER_CLAIMS)
+        # from_db expects values in model field order
+        field_names = [f.attname for f in model._meta.concrete_fields if f.attname in loaded]
+        return model.from_db(
+            router.db_for_read(model),
+            field_names,
+            [loaded[name] for name in field_names],
+        )
+
+
+class DatabaseJWTAuthentication(JWTAuthentication):
+    """The stock per-request user lookup, for views that need the full row."""
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if validated_token.get("token_version", user.token_version) < user.token_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return user
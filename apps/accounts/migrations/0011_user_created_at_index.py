@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-17 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_user_recently_viewed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['created_at'], name='accounts_us_created_4734df_idx'),
+        ),
+    ]
@@ -1,7 +1,8 @@
-import os
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from apps.core.janitor import queue_deletion
 from .managers import UserManager
+from .tokens import publish_token_version
 class User(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(unique=True)
     name = models.CharField(max_length=100)
@@ -10,10 +11,12 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_admin = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True) 
+    token_version = models.PositiveIntegerField(default=0, editable=False)
     image = models.ImageField(
         upload_to="profiles/",
         default="profiles/default.png",
     )
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     recently_viewed = models.ManyToManyField(
         "products.Product",
         blank=True,
@@ -22,16 +25,38 @@ class User(AbstractBaseUser, PermissionsMixin):
     objects = UserManager()
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["name"]
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+    # copied into tokens; changing any of them revokes issued tokens
+    TOKEN_CLAIM_FIELDS = ("is_active", "is_staff", "is_superuser")
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remembered so save() can drop a replaced image without a query
+        if "image" in field_names:
+            instance._stored_image = instance.image.name
+        if all(field in field_names for field in cls.TOKEN_CLAIM_FIELDS):
+            instance._stored_claims = instance.token_claims()
+        return instance
+    def token_claims(self):
+        return tuple(getattr(self, field) for field in self.TOKEN_CLAIM_FIELDS)
     def save(self, *args, **kwargs):
-        if self.pk:
-            try:
-                old = User.objects.get(pk=self.pk)
-                if old.image and old.image != self.image:
-                    if old.image.name != "profiles/default.png":
-                        if os.path.isfile(old.image.path):
-                            os.remove(old.image.path)
-            except User.DoesNotExist:
-                pass
+        stored_claims = getattr(self, "_stored_claims", None)
+        claims_changed = stored_claims is not None and stored_claims != self.token_claims()
+        if claims_changed:
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
         super().save(*args, **kwargs)
+        self._stored_claims = self.token_claims()
+        if claims_changed:
+            publish_token_version(self.pk, self.token_version)
+        old_image = getattr(self, "_stored_image", None)
+        if old_image and old_image != self.image.name and old_image != "profiles/default.png":
+            queue_deletion(self.image.storage, old_image)
+        self._stored_image = self.image.name
     def __str__(self):
         return self.email
@@ -1,7 +1,9 @@
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import authenticate
 from rest_framework import serializers
+from apps.core.images import rendition_urls
 from .models import User
+from .tokens import revoke_tokens
 
 
 class UserBasicSerializer(serializers.ModelSerializer):
@@ -98,6 +100,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
     )
 
     image = serializers.ImageField(required=False, allow_null=True)
+    images = serializers.SerializerMethodField()
     password = serializers.CharField(
         write_only=True,
         required=False,
@@ -111,6 +114,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             "email",
             "name",
             "image",
+            "images",
             "password",
             "created_at",
             "is_staff",
@@ -129,8 +133,12 @@ class UserProfileSerializer(serializers.ModelSerializer):
         password = validated_data.pop("password", None)
         if password:
             instance.set_password(password)
-        
-        return super().update(instance, validated_data)
+
+        instance = super().update(instance, validated_data)
+        if password:
+            # sessions opened with the old password end everywhere
+            revoke_tokens(instance)
+        return instance
 
     def get_image(self, obj):
         # Fallback for representation if needed, but DRF ImageField 
@@ -140,6 +148,9 @@ class UserProfileSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.image.url)
         return None
 
+    def get_images(self, obj):
+        return rendition_urls(obj, self.context.get("request"))
+
     def get_recently_viewed(self, obj):
         items = obj.recently_viewed.filter(is_active=True).order_by("-id")[:5]
         return self.ProductSerializer(
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.core.images import schedule_renditions
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def profile_image_renditions(sender, instance, **kwargs):
+    schedule_renditions(instance)
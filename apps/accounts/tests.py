@@ -1 +1,85 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .models import User
+
+
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="buyer@example.com",
+            password="pass12345",
+            name="Buyer",
+        )
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post(
+            "/api/accounts/auth/login/",
+            {"email": "buyer@example.com", "password": "pass12345"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def assert_access(self, status_code):
+        # cart uses the claims-only authentication, me/ loads the user row
+        self.assertEqual(self.client.get("/api/cart/").status_code, status_code)
+        self.assertEqual(self.client.get("/api/accounts/me/").status_code, status_code)
+
+    def test_logout_retires_only_this_sessions_refresh_token(self):
+        self.login()
+        laptop, self.client = self.client, APIClient()
+        self.login()
+        refresh = laptop.cookies["refresh"].value
+
+        self.assertEqual(laptop.post("/api/accounts/auth/logout/").status_code, 200)
+
+        laptop.cookies["refresh"] = refresh
+        self.assertEqual(laptop.post("/api/accounts/auth/refresh/").status_code, 401)
+        # the other device stays signed in
+        self.assert_access(200)
+        self.assertEqual(self.client.post("/api/accounts/auth/refresh/").status_code, 200)
+
+    def test_logout_all_revokes_every_session(self):
+        self.login()
+        self.assert_access(200)
+
+        self.assertEqual(self.client.post("/api/accounts/auth/logout-all/").status_code, 200)
+
+        self.assert_access(401)
+
+    def test_password_change_revokes_the_access_token(self):
+        self.login()
+
+        response = self.client.patch(
+            "/api/accounts/profile/", {"password": "n3w-Passw0rd!"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assert_access(401)
+
+    def test_deactivation_revokes_the_access_token(self):
+        self.login()
+        self.assert_access(200)
+
+        # e.g. an edit in Django admin, which calls save() directly
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+
+        self.assert_access(401)
+
+    def test_revocation_survives_a_cache_miss(self):
+        self.login()
+        self.assert_access(200)
+
+        user = User.objects.get(pk=self.user.pk)
+        user.is_staff = True
+        user.save()
+        # another worker, or an evicted entry
+        cache.clear()
+
+        self.assert_access(401)
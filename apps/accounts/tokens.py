@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+# claims copied from the user into every token so requests can be
+# authenticated without loading the user row
+USER_CLAIMS = ("is_staff", "is_superuser", "is_active", "token_version")
+
+
+def token_version_key(user_id):
+    return f"accounts:token_version:{user_id}"
+
+
+def set_user_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class UserRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        return set_user_claims(super().for_user(user), user)
+
+
+def publish_token_version(user_id, version):
+    """Cache ``version`` as the user's current one once the change commits."""
+    transaction.on_commit(lambda: cache.set(
+        token_version_key(user_id),
+        version,
+        settings.TOKEN_VERSION_CACHE_TIMEOUT,
+    ))
+
+
+def current_token_version(model, user_id):
+    """
+    The user's current token version, or None for a missing user.
+
+    Read from the cache, falling back to one single-column query when the
+    entry is missing or was culled.
+    """
+    key = token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            model._default_manager
+            .filter(pk=user_id)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is not None:
+            cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def revoke_tokens(user):
+    """
+    Invalidate every token issued to ``user`` so far. Changing
+    ``is_active``, ``is_staff`` or ``is_superuser`` does this on save.
+    """
+    type(user).objects.filter(pk=user.pk).update(token_version=F("token_version") + 1)
+    user.refresh_from_db(fields=["token_version"])
+    publish_token_version(user.pk, user.token_version)
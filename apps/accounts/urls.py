@@ -4,6 +4,7 @@ from .views.auth_views import (
     LoginView,
     RefreshView,
     LogoutView,
+    LogoutAllView,
 )
 from .views.user_views import (
     MeView,
@@ -20,6 +21,7 @@ urlpatterns = [
     path("auth/login/", LoginView.as_view(), name="login"),
     path("auth/refresh/", RefreshView.as_view(), name="token-refresh"),
     path("auth/logout/", LogoutView.as_view(), name="logout"),
+    path("auth/logout-all/", LogoutAllView.as_view(), name="logout-all"),
     # ---------- USER ----------
     path("me/", MeView.as_view(), name="me"),
     path("profile/", ProfileUpdateView.as_view(), name="profile"),
@@ -5,13 +5,13 @@ from rest_framework import status
 from apps.accounts.models import User
 from apps.accounts.serializers import AdminUserSerializer
 from apps.orders.models import Order
-from rest_framework.pagination import PageNumberPagination
+from apps.core.pagination import OptionalKeysetPagination
 class AdminUserListView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
     def get(self, request):
         try:
             queryset = User.objects.all().order_by("-created_at")
-            paginator=PageNumberPagination()
+            paginator=OptionalKeysetPagination()
             page=paginator.paginate_queryset(queryset,request)
             serializer = AdminUserSerializer(page, many=True)
             return paginator.get_paginated_response(serializer.data)
@@ -42,6 +42,7 @@ class AdminUserDetailView(APIView):
                     {"errors":serializer.errors},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            # User.save revokes issued tokens when a claim changes
             serializer.save()
             return Response(
                 serializer.data,status=status.HTTP_200_OK
@@ -7,6 +7,11 @@ from rest_framework.views import APIView
 
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.accounts.models import User
+from apps.accounts.tokens import UserRefreshToken, revoke_tokens, set_user_claims
+from apps.cart.guest import merge_guest_cart
 
 from apps.accounts.serializers import (
     RegisterSerializer,
@@ -27,7 +32,7 @@ class RegisterView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
 
         response = Response(
             {
@@ -36,6 +41,7 @@ class RegisterView(generics.CreateAPIView):
             },
             status=status.HTTP_201_CREATED,
         )
+        merge_guest_cart(request, response, user)
 
         response.set_cookie(
             key="refresh",
@@ -62,7 +68,7 @@ class LoginView(APIView):
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
             user = serializer.validated_data["user"]
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
 
             response = Response(
                 {
@@ -71,6 +77,7 @@ class LoginView(APIView):
                 },
                 status=status.HTTP_200_OK,
             )
+            merge_guest_cart(request, response, user)
 
             response.set_cookie(
                 key="refresh",
@@ -110,6 +117,20 @@ class RefreshView(APIView):
 
         try:
             refresh = RefreshToken(refresh_token)
+            user = (
+                User.objects
+                .filter(pk=refresh[api_settings.USER_ID_CLAIM])
+                .only("id", "is_staff", "is_superuser", "is_active", "token_version")
+                .first()
+            )
+            # the one place claims are checked against the database
+            if (
+                user is None
+                or not user.is_active
+                or refresh.get("token_version", user.token_version) != user.token_version
+            ):
+                raise TokenError("Token has been revoked")
+            set_user_claims(refresh, user)
             access_token = refresh.access_token
 
             response = Response(
@@ -161,3 +182,18 @@ class LogoutView(APIView):
 
         response.delete_cookie("refresh", path="/")
         return response
+
+
+# ============================
+# LOGOUT EVERYWHERE
+# ============================
+class LogoutAllView(LogoutView):
+    """
+    Log out every session: bumping ``token_version`` retires all access and
+    refresh tokens the user holds, not just this device's.
+    """
+
+    def post(self, request):
+        response = super().post(request)
+        revoke_tokens(request.user)
+        return response
@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
+from apps.accounts.authentication import DatabaseJWTAuthentication
 from apps.accounts.serializers import UserProfileSerializer, UserBasicSerializer
 
 
@@ -10,6 +11,7 @@ from apps.accounts.serializers import UserProfileSerializer, UserBasicSerializer
 # CURRENT USER
 # ============================
 class MeView(APIView):
+    authentication_classes = [DatabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -23,6 +25,7 @@ class MeView(APIView):
 # PROFILE GET / UPDATE
 # ============================
 class ProfileUpdateView(APIView):
+    authentication_classes = [DatabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
@@ -0,0 +1,118 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.products.models import Product
+from .services import apply_cart_operations
+
+
+GUEST_CART_COOKIE = "guest_cart"
+GUEST_CART_SALT = "cart.guest"
+
+
+class GuestCartFull(Exception):
+    pass
+
+
+def _cache_key(cart_id):
+    return f"cart:guest:{cart_id}"
+
+
+def _store():
+    return caches[settings.GUEST_CART_CACHE]
+
+
+def _ttl():
+    return int(settings.GUEST_CART_TTL.total_seconds())
+
+
+def guest_cart_id(request):
+    return request.get_signed_cookie(
+        GUEST_CART_COOKIE,
+        default=None,
+        salt=GUEST_CART_SALT,
+        max_age=_ttl(),
+    )
+
+
+def load_guest_cart(cart_id):
+    """``{product_id: quantity}``; empty for a missing or expired cart."""
+    if cart_id is None:
+        return {}
+    return _store().get(_cache_key(cart_id)) or {}
+
+
+def save_guest_cart(response, cart_id, lines):
+    """Store ``lines`` and (re)issue the cookie; returns the cart id used."""
+    cart_id = cart_id or uuid.uuid4().hex
+    _store().set(_cache_key(cart_id), lines, _ttl())
+    response.set_signed_cookie(
+        GUEST_CART_COOKIE,
+        cart_id,
+        salt=GUEST_CART_SALT,
+        max_age=_ttl(),
+        httponly=True,
+        secure=not settings.DEBUG,
+        samesite="Lax" if settings.DEBUG else "None",
+        path="/",
+    )
+    return cart_id
+
+
+def clear_guest_cart(response, cart_id):
+    if cart_id is not None:
+        _store().delete(_cache_key(cart_id))
+    response.delete_cookie(GUEST_CART_COOKIE, path="/", samesite="Lax" if settings.DEBUG else "None")
+
+
+def apply_guest_operations(lines, operations):
+    """Apply cart operations to a guest cart dict in place (see apply_cart_operations)."""
+    for operation in operations:
+        product_id = operation["product_id"]
+        if operation["op"] == "remove":
+            quantity = 0
+        elif operation["op"] == "add":
+            quantity = lines.get(product_id, 0) + operation["quantity"]
+        else:
+            quantity = operation["quantity"]
+        quantity = min(quantity, settings.GUEST_CART_MAX_QUANTITY)
+        if quantity <= 0:
+            lines.pop(product_id, None)
+        else:
+            lines[product_id] = quantity
+    if len(lines) > settings.GUEST_CART_MAX_LINES:
+        raise GuestCartFull(
+            f"A guest cart holds at most {settings.GUEST_CART_MAX_LINES} products."
+        )
+    return lines
+
+
+def merge_guest_cart(request, response, user):
+    """
+    Add the request's guest cart to ``user``'s cart with one bulk upsert,
+    then drop it. Called after login and registration.
+
+    A merged line is capped at ``GUEST_CART_MAX_QUANTITY`` and the product's
+    stock; lines for inactive or sold-out products are dropped.
+    """
+    cart_id = guest_cart_id(request)
+    lines = load_guest_cart(cart_id)
+    if lines:
+        caps = {
+            product_id: min(stock, settings.GUEST_CART_MAX_QUANTITY)
+            for product_id, stock in (
+                Product.objects
+                .filter(id__in=lines, is_active=True, stock__gt=0)
+                .values_list("id", "stock")
+            )
+        }
+        operations = [
+            {"product_id": product_id, "quantity": quantity, "op": "add"}
+            for product_id, quantity in lines.items()
+            if product_id in caps
+        ]
+        if operations:
+            apply_cart_operations(user, operations, caps=caps)
+    if cart_id is not None:
+        clear_guest_cart(response, cart_id)
@@ -1,11 +1,14 @@
+from django.conf import settings
 from rest_framework import serializers
+from apps.core.sparse import SparseFieldsetMixin
 from .models import CartItem
+from .services import CART_OPERATIONS
 from apps.products.models import Product
-from apps.products.serializers.user_serializers import ProductSerializer
+from apps.products.serializers.user_serializers import ProductCardSerializer
 
 
-class CartItemSerializer(serializers.ModelSerializer):
-    product = ProductSerializer(read_only=True)
+class CartItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    product = ProductCardSerializer(read_only=True)
     subtotal = serializers.ReadOnlyField()
     product_id = serializers.PrimaryKeyRelatedField(
         queryset=Product.objects.all(),
@@ -27,3 +30,46 @@ class CartItemSerializer(serializers.ModelSerializer):
         if value < 1:
             raise serializers.ValidationError("Quantity must be at least 1.")
         return value
+
+
+
+class CartOperationListSerializer(serializers.ListSerializer):
+    def validate(self, attrs):
+        # one stock query for the whole batch; missing and inactive products
+        # are reported by the view
+        stock = dict(
+            Product.objects
+            .filter(id__in={operation["product_id"] for operation in attrs}, is_active=True)
+            .values_list("id", "stock")
+        )
+        short = [
+            f"Only {stock[operation['product_id']]} of product {operation['product_id']} in stock."
+            for operation in attrs
+            if operation["op"] != "remove"
+            and operation["product_id"] in stock
+            and operation["quantity"] > stock[operation["product_id"]]
+        ]
+        if short:
+            raise serializers.ValidationError({"quantity": short})
+        return attrs
+
+
+class CartOperationSerializer(serializers.Serializer):
+    # plain ids: products are checked in one query by the view
+    product_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(
+        min_value=0,
+        max_value=settings.CART_MAX_QUANTITY,
+        default=1,
+    )
+    op = serializers.ChoiceField(choices=CART_OPERATIONS, default="set")
+
+    class Meta:
+        list_serializer_class = CartOperationListSerializer
+
+    def validate(self, attrs):
+        if attrs["op"] == "add" and attrs["quantity"] < 1:
+            raise serializers.ValidationError(
+                {"quantity": "Quantity must be at least 1."}
+            )
+        return attrs
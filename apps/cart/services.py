@@ -0,0 +1,69 @@
+from django.db import transaction
+
+from apps.products.models import Product
+from .models import CartItem
+
+
+CART_OPERATIONS = ("set", "add", "remove")
+
+
+def unavailable_product_ids(product_ids):
+    """The ids in ``product_ids`` that are missing or inactive, in one query."""
+    product_ids = set(product_ids)
+    available = Product.objects.filter(id__in=product_ids, is_active=True).values_list("id", flat=True)
+    return sorted(product_ids - set(available))
+
+
+@transaction.atomic
+def apply_cart_operations(user, operations, caps=None):
+    """
+    Apply ``[{"product_id", "quantity", "op"}, ...]`` to ``user``'s cart, in
+    order, as one upsert and one delete.
+
+    ``set`` replaces the quantity (0 removes the line), ``add`` increments
+    it and ``remove`` deletes the line. ``caps`` (``{product_id: max}``)
+    limits how far ``add`` raises a line; it never lowers one. Returns the
+    product ids that changed.
+    """
+    product_ids = {operation["product_id"] for operation in operations}
+    current = dict(
+        CartItem.objects
+        .select_for_update()
+        .filter(user=user, product_id__in=product_ids)
+        .values_list("product_id", "quantity")
+    )
+
+    final = dict(current)
+    for operation in operations:
+        product_id = operation["product_id"]
+        if operation["op"] == "remove":
+            final[product_id] = 0
+        elif operation["op"] == "add":
+            quantity = final.get(product_id, 0)
+            added = quantity + operation["quantity"]
+            if caps is not None and product_id in caps:
+                added = max(quantity, min(added, caps[product_id]))
+            final[product_id] = added
+        else:
+            final[product_id] = operation["quantity"]
+
+    upserts = [
+        CartItem(user=user, product_id=product_id, quantity=quantity)
+        for product_id, quantity in final.items()
+        if quantity > 0 and quantity != current.get(product_id)
+    ]
+    removals = [
+        product_id for product_id, quantity in final.items()
+        if quantity <= 0 and product_id in current
+    ]
+    # rows added by a concurrent request since the read above are
+    # overwritten via unique_user_product_cart rather than duplicated
+    CartItem.objects.bulk_create(
+        upserts,
+        update_conflicts=True,
+        unique_fields=["user", "product"],
+        update_fields=["quantity", "updated_at"],
+    )
+    if removals:
+        CartItem.objects.filter(user=user, product_id__in=removals).delete()
+    return [item.product_id for item in upserts] + removals
@@ -1,3 +1,209 @@
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.products.models import Allergen, Category, Ingredient, Nutrition, Product
+from .models import CartItem
+
+
+def make_catalog(count):
+    category = Category.objects.create(name=f"Tubs {count}")
+    milk, _ = Ingredient.objects.get_or_create(name="Milk")
+    nuts, _ = Allergen.objects.get_or_create(name="Nuts")
+    products = []
+    for index in range(count):
+        product = Product.objects.create(
+            name=f"Flavour {count}-{index}",
+            price=Decimal("120.00"),
+            image="products/test.jpg",
+            category=category,
+            stock=10,
+        )
+        product.ingredients.add(milk)
+        product.allergens.add(nuts)
+        Nutrition.objects.create(
+            product=product, calories=200, protein=3, fat=10, carbs=25, sugar=20
+        )
+        products.append(product)
+    return products
+
+
+class CartListQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="cart@example.com", password="pass12345", name="Cart User"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def cart_queries(self, count):
+        CartItem.objects.filter(user=self.user).delete()
+        for product in make_catalog(count):
+            CartItem.objects.create(user=self.user, product=product, quantity=2)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/cart/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], count)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_cart_size(self):
+        self.assertEqual(self.cart_queries(1), self.cart_queries(8))
+
+    def test_embeds_product_card(self):
+        product = make_catalog(1)[0]
+        CartItem.objects.create(user=self.user, product=product, quantity=3)
+
+        item = self.client.get("/api/cart/").data["results"][0]
+
+        self.assertEqual(item["product"]["slug"], product.slug)
+        self.assertEqual(item["subtotal"], Decimal("360.00"))
+        self.assertNotIn("ingredients", item["product"])
+
+    def test_fields_prune_cart_rows(self):
+        product = make_catalog(1)[0]
+        CartItem.objects.create(user=self.user, product=product, quantity=3)
+
+        item = self.client.get("/api/cart/", {"fields": "id,quantity,product.name"}).data["results"][0]
+
+        self.assertEqual(set(item), {"id", "quantity", "product"})
+        self.assertEqual(item["product"], {"name": product.name})
+
+
+class CartSummaryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="summary@example.com", password="pass12345", name="Summary User"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_totals_and_stock_flags_in_one_query(self):
+        cone, tub = make_catalog(2)
+        tub.stock = 1
+        tub.save()
+        CartItem.objects.create(user=self.user, product=cone, quantity=2)
+        CartItem.objects.create(user=self.user, product=tub, quantity=3)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/cart/summary/")
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.data["item_count"], 2)
+        self.assertEqual(response.data["units"], 5)
+        self.assertEqual(response.data["total"], Decimal("600.00"))
+        self.assertTrue(response.data["has_out_of_stock"])
+        flags = {item["product_id"]: item["in_stock"] for item in response.data["items"]}
+        self.assertEqual(flags, {cone.id: True, tub.id: False})
+
+    def test_empty_cart(self):
+        response = self.client.get("/api/cart/summary/")
+        self.assertEqual(response.data["item_count"], 0)
+        self.assertEqual(response.data["total"], Decimal("0.00"))
+
+
+class CartBatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="batch@example.com", password="pass12345", name="Batch User"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_set_add_and_remove_in_one_request(self):
+        cone, tub, bar = make_catalog(3)
+        CartItem.objects.create(user=self.user, product=cone, quantity=1)
+        CartItem.objects.create(user=self.user, product=bar, quantity=4)
+
+        response = self.client.post("/api/cart/batch/", {"operations": [
+            {"product_id": cone.id, "quantity": 2, "op": "add"},
+            {"product_id": tub.id, "quantity": 5},
+            {"product_id": bar.id, "op": "remove"},
+        ]}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        quantities = dict(
+            CartItem.objects.filter(user=self.user).values_list("product_id", "quantity")
+        )
+        self.assertEqual(quantities, {cone.id: 3, tub.id: 5})
+        self.assertEqual(len(response.data["items"]), 2)
+
+    def test_unknown_product_rejects_whole_batch(self):
+        cone = make_catalog(1)[0]
+        response = self.client.post("/api/cart/batch/", [
+            {"product_id": cone.id, "quantity": 2},
+            {"product_id": 999999, "quantity": 1},
+        ], format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["product_ids"], [999999])
+        self.assertFalse(CartItem.objects.filter(user=self.user).exists())
+
+    def test_quantities_are_capped_and_checked_against_stock(self):
+        cone = make_catalog(1)[0]
+
+        for quantity in (2 ** 40, 11):
+            response = self.client.post("/api/cart/batch/", [
+                {"product_id": cone.id, "quantity": quantity},
+            ], format="json")
+            self.assertEqual(response.status_code, 400)
+            response = self.client.post("/api/cart/guest/", [
+                {"product_id": cone.id, "quantity": quantity},
+            ], format="json")
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(CartItem.objects.filter(user=self.user).exists())
+
+
+class GuestCartTests(TestCase):
+    def test_guest_cart_merges_into_user_cart_on_login(self):
+        cone, tub = make_catalog(2)
+        user = User.objects.create_user(
+            email="guest@example.com", password="pass12345", name="Guest User"
+        )
+        CartItem.objects.create(user=user, product=cone, quantity=1)
+        client = APIClient()
+
+        response = client.post("/api/cart/guest/", [
+            {"product_id": cone.id, "quantity": 2},
+            {"product_id": tub.id, "quantity": 1},
+        ], format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total"], Decimal("360.00"))
+        self.assertFalse(CartItem.objects.filter(product=tub).exists())
+
+        response = client.post(
+            "/api/accounts/auth/login/",
+            {"email": "guest@example.com", "password": "pass12345"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        quantities = dict(CartItem.objects.filter(user=user).values_list("product_id", "quantity"))
+        self.assertEqual(quantities, {cone.id: 3, tub.id: 1})
+        self.assertEqual(client.get("/api/cart/guest/").data["items"], [])
+
+    def test_merge_caps_lines_at_stock_and_drops_sold_out_products(self):
+        cone, tub = make_catalog(2)
+        user = User.objects.create_user(
+            email="guest@example.com", password="pass12345", name="Guest User"
+        )
+        CartItem.objects.create(user=user, product=cone, quantity=2)
+        client = APIClient()
+        client.post("/api/cart/guest/", [
+            {"product_id": cone.id, "quantity": 5},
+            {"product_id": tub.id, "quantity": 1},
+        ], format="json")
+        Product.objects.filter(pk=cone.pk).update(stock=3)
+        Product.objects.filter(pk=tub.pk).update(stock=0)
+
+        client.post(
+            "/api/accounts/auth/login/",
+            {"email": "guest@example.com", "password": "pass12345"},
+            format="json",
+        )
 
-# Create your tests here.
+        quantities = dict(CartItem.objects.filter(user=user).values_list("product_id", "quantity"))
+        self.assertEqual(quantities, {cone.id: 3})
@@ -1,7 +1,12 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from apps.cart.views.user_views import CartItemViewSet
+from apps.cart.views.guest_views import GuestCartView
 
 router = DefaultRouter()
 router.register(r"cart", CartItemViewSet, basename="cart")
 
-urlpatterns = router.urls
+# before the router, whose cart/<pk>/ route would otherwise match "guest"
+urlpatterns = [
+    path("cart/guest/", GuestCartView.as_view(), name="cart-guest"),
+] + router.urls
@@ -0,0 +1,77 @@
+from decimal import Decimal
+from rest_framework.views import APIView
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework import status
+from apps.products.models import Product
+from apps.products.queries import PRODUCT_CARD_COLUMNS
+from apps.products.serializers.user_serializers import ProductCardSerializer
+from ..guest import (
+    GuestCartFull,
+    apply_guest_operations,
+    clear_guest_cart,
+    guest_cart_id,
+    load_guest_cart,
+    save_guest_cart,
+)
+from ..serializers import CartOperationSerializer
+from ..services import unavailable_product_ids
+class GuestCartView(APIView):
+    """
+    Cart for anonymous shoppers, kept in the cache under a signed cookie and
+    merged into the user's cart at login/registration.
+    """
+    permission_classes = [AllowAny]
+
+    def render_cart(self, request, lines, response_status=status.HTTP_200_OK):
+        products = Product.objects.filter(id__in=lines, is_active=True).only(*PRODUCT_CARD_COLUMNS)
+        items = []
+        total = Decimal("0.00")
+        for product in products:
+            subtotal = product.price * lines[product.id]
+            total += subtotal
+            items.append({
+                "product": ProductCardSerializer(product, context={"request": request}).data,
+                "quantity": lines[product.id],
+                "subtotal": subtotal,
+            })
+        return Response({"items": items, "total": total}, status=response_status)
+
+    def get(self, request):
+        return self.render_cart(request, load_guest_cart(guest_cart_id(request)))
+
+    def post(self, request):
+        operations = request.data.get("operations") if isinstance(request.data, dict) else request.data
+        if isinstance(operations, dict):
+            operations = [operations]
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"detail": "Send an operation or a non-empty list of operations."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = CartOperationSerializer(data=operations, many=True)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        unavailable = unavailable_product_ids(
+            operation["product_id"] for operation in serializer.validated_data
+            if operation["op"] != "remove"
+        )
+        if unavailable:
+            return Response(
+                {"detail": "Some products are unavailable.", "product_ids": unavailable},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cart_id = guest_cart_id(request)
+        try:
+            lines = apply_guest_operations(load_guest_cart(cart_id), serializer.validated_data)
+        except GuestCartFull as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        response = self.render_cart(request, lines)
+        save_guest_cart(response, cart_id, lines)
+        return response
+
+    def delete(self, request):
+        response = Response(status=status.HTTP_204_NO_CONTENT)
+        clear_guest_cart(response, guest_cart_id(request))
+        return response
@@ -1,19 +1,20 @@
+from decimal import Decimal
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum, Window
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
+from apps.products.queries import with_product_card
 from ..models import CartItem
-from ..serializers import CartItemSerializer
+from ..serializers import CartItemSerializer, CartOperationSerializer
+from ..services import apply_cart_operations, unavailable_product_ids
 class CartItemViewSet(ModelViewSet):
     serializer_class = CartItemSerializer
     permission_classes = [IsAuthenticated]
+    max_batch_operations = 200
     def get_queryset(self):
-        return (
-            CartItem.objects
-            .filter(user=self.request.user)
-            .select_related("product")
-        )
+        return with_product_card(CartItem.objects.filter(user=self.request.user))
 
     def perform_create(self, serializer):
         serializer.save(
@@ -30,3 +31,89 @@ class CartItemViewSet(ModelViewSet):
             {"detail": "Cart cleared"},
             status=status.HTTP_204_NO_CONTENT
         )
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        # one query: per-line values plus cart-wide window totals on every row
+        line_total = ExpressionWrapper(
+            F("quantity") * F("product__price"),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        )
+        lines = list(
+            CartItem.objects
+            .filter(user=request.user)
+            .annotate(
+                line_subtotal=line_total,
+                cart_total=Window(Sum(line_total)),
+                cart_units=Window(Sum("quantity")),
+            )
+            .values(
+                "id",
+                "product_id",
+                "product__name",
+                "product__slug",
+                "product__price",
+                "product__stock",
+                "product__is_active",
+                "quantity",
+                "line_subtotal",
+                "cart_total",
+                "cart_units",
+            )
+            .order_by("-id")
+        )
+        items = [
+            {
+                "id": line["id"],
+                "product_id": line["product_id"],
+                "name": line["product__name"],
+                "slug": line["product__slug"],
+                "price": line["product__price"],
+                "quantity": line["quantity"],
+                "subtotal": line["line_subtotal"],
+                "available": line["product__stock"],
+                "in_stock": (
+                    line["product__is_active"]
+                    and line["product__stock"] >= line["quantity"]
+                ),
+            }
+            for line in lines
+        ]
+        return Response({
+            "item_count": len(items),
+            "units": lines[0]["cart_units"] if lines else 0,
+            "total": lines[0]["cart_total"] if lines else Decimal("0.00"),
+            "has_out_of_stock": any(not item["in_stock"] for item in items),
+            "items": items,
+        })
+
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        operations = request.data.get("operations") if isinstance(request.data, dict) else request.data
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"detail": "Send a non-empty list of operations."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(operations) > self.max_batch_operations:
+            return Response(
+                {"detail": f"At most {self.max_batch_operations} operations per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = CartOperationSerializer(data=operations, many=True)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        unavailable = unavailable_product_ids(
+            operation["product_id"] for operation in serializer.validated_data
+            if operation["op"] != "remove"
+        )
+        if unavailable:
+            return Response(
+                {"detail": "Some products are unavailable.", "product_ids": unavailable},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        apply_cart_operations(request.user, serializer.validated_data)
+        items = self.get_serializer(self.get_queryset(), many=True).data
+        return Response({"items": items}, status=status.HTTP_200_OK)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import IdempotencyKey
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "scope", "key", "response_status", "created_at", "expires_at")
+    list_filter = ("scope", "response_status")
+    search_fields = ("key", "user__email")
+    readonly_fields = ("request_hash", "response_body", "created_at")
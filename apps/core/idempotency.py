@@ -0,0 +1,123 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(request):
+    data = request.data
+    if hasattr(data, "lists"):
+        data = {key: values for key, values in data.lists()}
+    payload = json.dumps(
+        {"method": request.method, "path": request.path, "data": data},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _replay(record, request_hash):
+    if record.request_hash != request_hash:
+        return Response(
+            {"detail": "Idempotency-Key was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if record.response_status is None:
+        return Response(
+            {"detail": "A request with this Idempotency-Key is still in progress."},
+            status=status.HTTP_409_CONFLICT,
+        )
+    return Response(
+        record.response_body,
+        status=record.response_status,
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def idempotent(scope):
+    """
+    Make an APIView method replay its first successful response for a
+    repeated ``Idempotency-Key`` header from the same user.
+
+    A replay costs one indexed lookup. The key is claimed, the view runs
+    and its response is stored in one transaction, so a crash or error
+    leaves no half-claimed key behind; a concurrent duplicate waits on the
+    unique index and then replays the stored response. Only 2xx responses
+    are stored; errors release the key so the client can retry. A
+    ``transaction.atomic`` on the view nests inside as a savepoint.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key or not request.user.is_authenticated:
+                return view_method(self, request, *args, **kwargs)
+            if len(key) > 255:
+                return Response(
+                    {"detail": "Idempotency-Key must be at most 255 characters."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            request_hash = request_fingerprint(request)
+            lookup = {"user_id": request.user.id, "scope": scope, "key": key}
+            now = timezone.now()
+
+            record = IdempotencyKey.objects.filter(**lookup).first()
+            if record is not None:
+                if record.expires_at > now:
+                    return _replay(record, request_hash)
+                record.delete()
+
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        record = IdempotencyKey.objects.create(
+                            request_hash=request_hash,
+                            expires_at=now + settings.IDEMPOTENCY_KEY_TTL,
+                            **lookup,
+                        )
+                except IntegrityError:
+                    # a concurrent retry claimed the key and has committed
+                    record = IdempotencyKey.objects.filter(**lookup).first()
+                    if record is None:
+                        return Response(
+                            {"detail": "A request with this Idempotency-Key is still in progress."},
+                            status=status.HTTP_409_CONFLICT,
+                        )
+                    return _replay(record, request_hash)
+
+                response = view_method(self, request, *args, **kwargs)
+                if not status.is_success(response.status_code):
+                    record.delete()
+                    return response
+
+                # stored exactly as rendered so replays match the original body
+                record.response_status = response.status_code
+                record.response_body = json.loads(JSONRenderer().render(response.data) or "null")
+                record.save(update_fields=["response_status", "response_body"])
+            return response
+        return wrapper
+    return decorator
+
+
+def purge_expired_keys(batch_size=1000):
+    """Delete expired keys in primary-key batches; returns the count."""
+    expired = IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+    deleted = 0
+    while True:
+        ids = list(expired.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
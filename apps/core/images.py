@@ -0,0 +1,161 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from PIL import Image, ImageOps
+
+from .janitor import queue_deletion
+
+
+logger = logging.getLogger(__name__)
+
+# longest edge in pixels; images are never upscaled
+RENDITIONS = {
+    "thumb": 160,
+    "card": 480,
+    "detail": 1200,
+}
+RENDITION_FORMATS = {
+    "webp": "WEBP",
+    "jpeg": "JPEG",
+}
+RENDITION_QUALITY = 80
+RENDITIONS_FIELD = "image_renditions"
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_RENDITION_WORKERS,
+            thread_name_prefix="renditions",
+        )
+    return _executor
+
+
+def _encode(image, image_format):
+    if image_format == "JPEG" or image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, quality=RENDITION_QUALITY)
+    return buffer.getvalue()
+
+
+def build_renditions(storage, name):
+    """
+    Write every size/format rendition of ``name`` and return the map stored
+    on the model: ``{"source": name, "thumb": {"webp": path, ...}, ...}``.
+    """
+    with storage.open(name, "rb") as source:
+        original = ImageOps.exif_transpose(Image.open(source))
+        original.load()
+
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    renditions = {"source": name}
+    for size_name, edge in RENDITIONS.items():
+        image = original.copy()
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        renditions[size_name] = {
+            extension: storage.save(
+                posixpath.join("renditions", directory, f"{stem}_{size_name}.{extension}"),
+                ContentFile(_encode(image, image_format)),
+            )
+            for extension, image_format in RENDITION_FORMATS.items()
+        }
+    return renditions
+
+
+def rendition_paths(renditions):
+    """Every rendition file named in a stored renditions map."""
+    return {
+        path
+        for size_name in RENDITIONS
+        for path in (renditions or {}).get(size_name, {}).values()
+        if path
+    }
+
+
+def delete_renditions(storage, renditions):
+    # renditions are content-hashed too, so other rows may share the files
+    for path in rendition_paths(renditions):
+        queue_deletion(storage, path)
+
+
+def renditions_outdated(instance, field="image"):
+    image = getattr(instance, field)
+    if not image or image.name == instance._meta.get_field(field).default:
+        return False
+    return (getattr(instance, RENDITIONS_FIELD) or {}).get("source") != image.name
+
+
+def process_renditions(model, pk, name, stale=None, after=None, field="image"):
+    """
+    Build renditions for ``name`` and attach them to row ``pk`` only if the
+    row still points at that image; a newer upload wins and the work done
+    here is discarded. Returns whether the row was updated.
+    """
+    storage = model._meta.get_field(field).storage
+    try:
+        renditions = build_renditions(storage, name)
+        updated = (
+            model._default_manager
+            .filter(pk=pk, **{field: name})
+            .update(**{RENDITIONS_FIELD: renditions})
+        )
+        if not updated:
+            delete_renditions(storage, renditions)
+            return False
+        delete_renditions(storage, stale)
+        if after is not None:
+            after()
+        return True
+    except Exception:
+        logger.exception("Failed to build renditions for %s", name)
+    return False
+
+
+def _process_in_worker(*args):
+    try:
+        process_renditions(*args)
+    finally:
+        # worker threads get their own connection; don't leak it
+        connection.close()
+
+
+def schedule_renditions(instance, after=None, field="image"):
+    """Queue rendition processing for ``instance`` once the upload commits."""
+    if not renditions_outdated(instance, field):
+        return
+    args = (
+        type(instance),
+        instance.pk,
+        getattr(instance, field).name,
+        getattr(instance, RENDITIONS_FIELD),
+        after,
+        field,
+    )
+    transaction.on_commit(lambda: get_executor().submit(_process_in_worker, *args))
+
+
+def rendition_urls(instance, request=None, field="image"):
+    """Absolute URLs of ready renditions, ``{}`` until the worker finishes."""
+    image = getattr(instance, field)
+    renditions = getattr(instance, RENDITIONS_FIELD) or {}
+    if not image or renditions.get("source") != image.name:
+        return {}
+    build = request.build_absolute_uri if request else str
+    return {
+        size_name: {
+            extension: build(image.storage.url(path))
+            for extension, path in renditions[size_name].items()
+        }
+        for size_name in RENDITIONS
+        if size_name in renditions
+    }
@@ -0,0 +1,63 @@
+import logging
+import queue
+import threading
+from collections import defaultdict
+
+from django.db import connection, transaction
+
+from .storage import referenced_names
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+
+_pending = queue.SimpleQueue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def queue_deletion(storage, name):
+    """
+    Delete ``name`` from ``storage`` in the background once the current
+    transaction commits. A rollback keeps the file, and a file that some
+    row still references (uploads are deduplicated) is never deleted.
+    Anything lost when the process exits is left to ``sweep_media``.
+    """
+    if name:
+        transaction.on_commit(lambda: _enqueue(storage, name))
+
+
+def _enqueue(storage, name):
+    global _worker
+    _pending.put((storage, name))
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="media-janitor", daemon=True)
+            _worker.start()
+
+
+def _run():
+    while True:
+        batch = [_pending.get()]
+        while len(batch) < BATCH_SIZE:
+            try:
+                batch.append(_pending.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            delete_batch(batch)
+        except Exception:
+            logger.exception("Media janitor failed on a batch of %d files", len(batch))
+        finally:
+            connection.close()
+
+
+def delete_batch(batch):
+    """Delete ``(storage, name)`` pairs, one reference query per file field."""
+    by_storage = defaultdict(set)
+    for storage, name in batch:
+        by_storage[storage].add(name)
+    for storage, names in by_storage.items():
+        for name in names - referenced_names(names):
+            storage.delete(name)
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.core.images import RENDITIONS_FIELD
+from apps.core.storage import ContentHashedStorage, delete_unreferenced, is_hashed_name
+from apps.products.cache import bump_catalog_version
+from apps.products.models import Category, Product
+
+
+# shared placeholder referenced by every new user; keep its stable name
+SKIP_NAMES = {"profiles/default.png"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Rename existing product, category and profile images to their "
+        "content-hashed names, deduplicating identical files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-originals",
+            action="store_true",
+            help="Leave the old files in place after repointing the rows.",
+        )
+
+    def handle(self, *args, **options):
+        moved = {}
+        for model in (Product, Category, get_user_model()):
+            storage = model._meta.get_field("image").storage
+            if not isinstance(storage, ContentHashedStorage):
+                self.stderr.write(f"{model.__name__}.image does not use ContentHashedStorage; skipped.")
+                continue
+            migrated = missing = 0
+            rows = (
+                model.objects
+                .exclude(image="")
+                .exclude(image__isnull=True)
+                .only("id", "image", RENDITIONS_FIELD)
+                .iterator(chunk_size=500)
+            )
+            for instance in rows:
+                old = instance.image.name
+                if old in SKIP_NAMES or is_hashed_name(old):
+                    continue
+                if old not in moved:
+                    if not storage.exists(old):
+                        missing += 1
+                        continue
+                    with storage.open(old, "rb") as source:
+                        moved[old] = storage.save(old, source)
+                new = moved[old]
+                renditions = getattr(instance, RENDITIONS_FIELD) or {}
+                if renditions.get("source") == old:
+                    # rendition files keep their names; only the source moved
+                    renditions["source"] = new
+                model.objects.filter(pk=instance.pk, image=old).update(
+                    image=new, **{RENDITIONS_FIELD: renditions}
+                )
+                migrated += 1
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: migrated {migrated}, missing files {missing}"
+            )
+
+        if not options["keep_originals"]:
+            storage = Product._meta.get_field("image").storage
+            for old in moved:
+                delete_unreferenced(storage, old)
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f"Hashed {len(moved)} files."))
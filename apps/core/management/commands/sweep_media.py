@@ -0,0 +1,77 @@
+import posixpath
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.utils import timezone
+
+from apps.core.images import RENDITIONS_FIELD, rendition_paths
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete media files that no row references: leftovers of rolled-back "
+        "uploads, replaced images and janitor work lost on shutdown."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument(
+            "--min-age-hours",
+            type=int,
+            default=24,
+            help="Skip files newer than this; their upload may not have committed yet.",
+        )
+
+    def walk(self, directory=""):
+        directories, files = default_storage.listdir(directory)
+        for name in files:
+            yield posixpath.join(directory, name)
+        for child in directories:
+            yield from self.walk(posixpath.join(directory, child))
+
+    def referenced(self):
+        names = set()
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, models.FileField):
+                    if isinstance(field.default, str):
+                        names.add(field.default)
+                    names.update(
+                        model._default_manager
+                        .exclude(**{field.name: ""})
+                        .values_list(field.name, flat=True)
+                        .iterator(chunk_size=2000)
+                    )
+            if any(field.name == RENDITIONS_FIELD for field in model._meta.concrete_fields):
+                for renditions in (
+                    model._default_manager
+                    .values_list(RENDITIONS_FIELD, flat=True)
+                    .iterator(chunk_size=2000)
+                ):
+                    names.update(rendition_paths(renditions))
+        names.discard(None)
+        return names
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["min_age_hours"])
+        # list first so files uploaded while we read the tables are never candidates
+        candidates = [
+            name for name in self.walk()
+            if default_storage.get_modified_time(name) < cutoff
+        ]
+        referenced = self.referenced()
+        orphans = [name for name in candidates if name not in referenced]
+
+        for name in orphans:
+            if options["dry_run"]:
+                self.stdout.write(name)
+            else:
+                default_storage.delete(name)
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(orphans)} of {len(candidates)} files older than "
+            f"{options['min_age_hours']}h."
+        ))
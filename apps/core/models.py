@@ -0,0 +1,28 @@
+from django.db import models
+from django.conf import settings
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys"
+    )
+    scope = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    # null while the first request is still running
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "scope", "key"],
+                name="unique_idempotency_key_per_user_scope"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["expires_at"]),
+        ]
+    def __str__(self):
+        return f"{self.scope}:{self.key} ({self.user_id})"
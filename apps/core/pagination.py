@@ -0,0 +1,67 @@
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over the view's current ordering (``?ordering=`` when
+    the view has an OrderingFilter). No COUNT(*) and no OFFSET, so a deep
+    page costs the same as the first one.
+    """
+    ordering = "-created_at"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        # the cursor holds the first field plus an offset into its ties,
+        # which only works if ties come back in the same order every time
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            direction = "-" if ordering[0].startswith("-") else ""
+            ordering += (f"{direction}id",)
+        return ordering
+
+
+class OptionalKeysetPagination(BasePagination):
+    """
+    Page-number pagination by default. Clients opt in to keyset pagination
+    with ``?pagination=keyset``; the ``next``/``previous`` links it returns
+    carry a ``cursor`` param and stay in keyset mode.
+    """
+    mode_query_param = "pagination"
+    keyset_mode = "keyset"
+    keyset_class = KeysetPagination
+    page_number_class = PageNumberPagination
+
+    def __init__(self):
+        self.paginator = None
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == self.keyset_mode
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request):
+            self.paginator = self.keyset_class()
+        else:
+            self.paginator = self.page_number_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return self.page_number_class().get_schema_operation_parameters(view)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, "display_page_controls", False)
+
+    def to_html(self):
+        return self.paginator.to_html()
@@ -0,0 +1,92 @@
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def _add_path(tree, path):
+    *parents, leaf = path.split(".")
+    node = tree
+    for name in parents:
+        child = node.get(name, {})
+        if child is None:
+            # the whole parent was already asked for
+            return
+        node = node.setdefault(name, child)
+    node[leaf] = None
+
+
+def _paths(request, param):
+    for value in request.query_params.getlist(param):
+        for path in value.split(","):
+            path = path.strip().strip(".")
+            if path:
+                yield path
+
+
+def sparse_fields(request):
+    """
+    The field tree requested by ``?fields=`` (plus ``?expand=``) on a GET,
+    or None when the full representation should be sent.
+
+    ``?fields=id,name,category.name`` ->
+    ``{"id": None, "name": None, "category": {"name": None}}``, where None
+    means "the whole field". ``?expand=`` adds whole nested objects on top
+    of a ``fields`` selection, e.g. ``?fields=id,name&expand=category``.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    paths = list(_paths(request, FIELDS_PARAM))
+    if not paths:
+        return None
+    tree = {}
+    for path in paths:
+        _add_path(tree, path)
+    for path in _paths(request, EXPAND_PARAM):
+        _add_path(tree, path)
+    return tree
+
+
+def wants(tree, name):
+    return tree is None or name in tree
+
+
+def subtree(tree, name):
+    """Tree for a nested field; None means everything, a missing field too."""
+    return None if tree is None else tree.get(name)
+
+
+def prune_fields(fields, tree):
+    for name in list(fields):
+        if name not in tree:
+            del fields[name]
+    for name, child in tree.items():
+        if child is None or name not in fields:
+            continue
+        field = fields[name]
+        if isinstance(field, ListSerializer):
+            field = field.child
+        if isinstance(field, BaseSerializer):
+            prune_fields(field.fields, child)
+
+
+class SparseFieldsetMixin:
+    """
+    Render only the fields asked for with ``?fields=`` / ``?expand=``.
+
+    Applies to the outermost serializer of a GET; nested serializers are
+    pruned through dotted paths (``?fields=id,product.name``).
+    """
+
+    @cached_property
+    def fields(self):
+        fields = super().fields
+        parent = self.parent.parent if isinstance(self.parent, ListSerializer) else self.parent
+        if parent is None:
+            tree = sparse_fields(self.context.get("request"))
+            if tree is not None:
+                prune_fields(fields, tree)
+        return fields
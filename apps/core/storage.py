@@ -0,0 +1,113 @@
+import hashlib
+import posixpath
+import re
+from functools import lru_cache, reduce
+from operator import or_
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.db.models import Q
+
+
+HASH_LENGTH = 32
+HASHED_NAME_RE = re.compile(rf"(^|/)[0-9a-f]{{{HASH_LENGTH}}}\.[a-z0-9]+$")
+
+
+def is_hashed_name(name):
+    return bool(HASHED_NAME_RE.search(name))
+
+
+class ContentHashedStorage(FileSystemStorage):
+    """
+    Store uploads as ``<upload_to>/<sha256 prefix>.<ext>``.
+
+    A name never changes content, so identical uploads share one file, URLs
+    can be cached by clients and CDNs forever, and ``url()`` is memoised.
+    Because files are shared, delete them through ``janitor.queue_deletion``
+    or ``delete_unreferenced``, which check references first.
+    """
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest.hexdigest()[:HASH_LENGTH] + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+    def url(self, name):
+        return self._cached_url(name)
+
+    @lru_cache(maxsize=8192)
+    def _cached_url(self, name):
+        return super().url(name)
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == "MEDIA_URL":
+            self._cached_url.cache_clear()
+
+
+def _file_fields():
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                yield model, field
+
+
+def _rendition_models():
+    from .images import RENDITIONS_FIELD
+
+    for model in apps.get_models():
+        if any(field.name == RENDITIONS_FIELD for field in model._meta.concrete_fields):
+            yield model
+
+
+def referenced_names(names):
+    """
+    The subset of ``names`` some row's file field or renditions map still
+    points at.
+    """
+    # images imports the janitor, which imports this module
+    from .images import RENDITION_FORMATS, RENDITIONS, RENDITIONS_FIELD, rendition_paths
+
+    names = set(names)
+    referenced = set()
+    for model, field in _file_fields():
+        referenced.update(
+            model._default_manager
+            .filter(**{f"{field.name}__in": names})
+            .values_list(field.name, flat=True)
+        )
+    in_renditions = reduce(or_, (
+        Q(**{f"{RENDITIONS_FIELD}__{size_name}__{extension}__in": names})
+        for size_name in RENDITIONS
+        for extension in RENDITION_FORMATS
+    ))
+    for model in _rendition_models():
+        for renditions in (
+            model._default_manager
+            .filter(in_renditions)
+            .values_list(RENDITIONS_FIELD, flat=True)
+        ):
+            referenced.update(rendition_paths(renditions) & names)
+    return referenced
+
+
+def delete_unreferenced(storage, name):
+    """Delete ``name`` unless another row shares the (deduplicated) file."""
+    if name and not referenced_names([name]):
+        storage.delete(name)
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.views.static import serve
+
+from .storage import is_hashed_name
+
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# legacy, non-hashed names (e.g. profiles/default.png) may still change
+MUTABLE_CACHE_CONTROL = "public, max-age=3600"
+
+
+def serve_media(request, path):
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    response["Cache-Control"] = (
+        IMMUTABLE_CACHE_CONTROL if is_hashed_name(path) else MUTABLE_CACHE_CONTROL
+    )
+    return response
@@ -1,7 +1,8 @@
 # apps/orders/admin.py
 
-from django.contrib import admin
-from .models import Order, OrderItem
+from django.contrib import admin, messages
+from .lifecycle import TransitionError, transition_orders
+from .models import Order, OrderItem, OrderStatusHistory, DailySalesRollup
 
 
 # =========================
@@ -23,6 +24,22 @@ class OrderItemInline(admin.TabularInline):
         return False
 
 
+class OrderStatusHistoryInline(admin.TabularInline):
+    model = OrderStatusHistory
+    extra = 0
+    can_delete = False
+
+    readonly_fields = (
+        "from_status",
+        "to_status",
+        "changed_by",
+        "created_at",
+    )
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 # =========================
 # ORDER ADMIN
 # =========================
@@ -52,16 +69,22 @@ class OrderAdmin(admin.ModelAdmin):
         "user__email",
     )
 
+    # status and payment change through orders.lifecycle (the actions
+    # below or the admin API) so rules, history and rollups stay in step
     readonly_fields = (
         "user",
         "total_amount",
+        "status",
+        "is_paid",
+        "payment_id",
+        "shipped_at",
         "created_at",
         "updated_at",
     )
 
-    list_editable = ("status",)
+    actions = ["mark_shipped", "mark_delivered", "mark_cancelled"]
 
-    inlines = [OrderItemInline]
+    inlines = [OrderItemInline, OrderStatusHistoryInline]
 
     ordering = ("-created_at",)
     date_hierarchy = "created_at"
@@ -71,6 +94,55 @@ class OrderAdmin(admin.ModelAdmin):
 
     items_count.short_description = "Items"
 
+    def transition(self, request, queryset, to_status):
+        try:
+            result = transition_orders(
+                queryset.values_list("id", flat=True),
+                to_status,
+                changed_by=request.user,
+            )
+        except TransitionError as exc:
+            self.message_user(request, exc.detail, messages.ERROR)
+            return
+        self.message_user(request, f"{len(result['updated'])} order(s) marked {to_status}.")
+        for line in result["rejected"]:
+            self.message_user(request, f"Order #{line['id']}: {line['detail']}", messages.WARNING)
+
+    @admin.action(description="Mark selected orders shipped")
+    def mark_shipped(self, request, queryset):
+        self.transition(request, queryset, "shipped")
+
+    @admin.action(description="Mark selected orders delivered")
+    def mark_delivered(self, request, queryset):
+        self.transition(request, queryset, "delivered")
+
+    @admin.action(description="Mark selected orders cancelled")
+    def mark_cancelled(self, request, queryset):
+        self.transition(request, queryset, "cancelled")
+
+
+# =========================
+# DAILY SALES ROLLUP ADMIN
+# =========================
+@admin.register(DailySalesRollup)
+class DailySalesRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "date",
+        "orders",
+        "paid_orders",
+        "revenue",
+        "units",
+    )
+
+    ordering = ("-date",)
+    date_hierarchy = "date"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 
 # =========================
 # ORDER ITEM ADMIN
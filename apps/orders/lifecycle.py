@@ -0,0 +1,162 @@
+from django.db import transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Order, OrderStatusHistory
+from .rollups import record_payment_change, record_payment_changes
+from .signals import order_status_changed
+
+
+# =======================
+# TRANSITION RULES
+# =======================
+# statuses an order may move to, keyed by its current status;
+# an order with no onward status is final
+TRANSITIONS = {
+    "awaiting_payment": {"pending", "paid", "shipped", "delivered", "cancelled"},
+    "pending": {"shipped", "delivered", "cancelled"},
+    "paid": {"shipped", "delivered", "cancelled"},
+    "shipped": {"delivered", "cancelled"},
+    "delivered": set(),
+    "cancelled": set(),
+}
+TARGET_STATUSES = set().union(*TRANSITIONS.values())
+FINAL_STATUSES = {status for status, targets in TRANSITIONS.items() if not targets}
+
+
+class TransitionError(Exception):
+    def __init__(self, detail):
+        self.detail = detail
+        super().__init__(detail)
+
+
+def allowed_from(to_status):
+    return [status for status, targets in TRANSITIONS.items() if to_status in targets]
+
+
+def rejection(order, to_status):
+    """Why ``order`` may not move to ``to_status``, or None if it may."""
+    if order.status in FINAL_STATUSES:
+        return f"Order is already {order.status} and cannot be modified"
+    if to_status not in TRANSITIONS[order.status]:
+        return f"Cannot transition from {order.status} to {to_status}"
+    if to_status == "shipped" and not order.is_paid:
+        return "Cannot ship an unpaid order."
+    return None
+
+
+# =======================
+# TRANSITIONS
+# =======================
+@transaction.atomic
+def transition_orders(order_ids, to_status, changed_by=None):
+    """
+    Move every order in ``order_ids`` to ``to_status`` the rules allow.
+
+    Rows are locked in primary-key order, then all eligible orders move in
+    one ``UPDATE ... WHERE status IN (...)`` and their history rows are
+    bulk-inserted. Returns ``{"updated": [...], "unchanged": [...],
+    "rejected": [{"id", "detail"}, ...]}``; orders already in
+    ``to_status`` are unchanged, unknown ids are rejected.
+    """
+    if to_status not in TARGET_STATUSES:
+        raise TransitionError(f"Invalid status: {to_status}")
+    order_ids = set(order_ids)
+    orders = list(
+        Order.objects
+        .select_for_update()
+        .filter(pk__in=order_ids)
+        .order_by("pk")
+        .only("id", "user", "status", "is_paid", "total_amount", "created_at")
+    )
+
+    moving, unchanged, rejected = [], [], []
+    for order in orders:
+        if order.status == to_status and order.status not in FINAL_STATUSES:
+            unchanged.append(order.id)
+            continue
+        detail = rejection(order, to_status)
+        if detail:
+            rejected.append({"id": order.id, "detail": detail})
+        else:
+            moving.append(order)
+    missing = order_ids - {order.id for order in orders}
+    rejected.extend({"id": order_id, "detail": "Not found."} for order_id in sorted(missing))
+
+    if moving:
+        _apply_transition(moving, to_status, changed_by)
+    return {
+        "updated": [order.id for order in moving],
+        "unchanged": unchanged,
+        "rejected": rejected,
+    }
+
+
+def _apply_transition(orders, to_status, changed_by):
+    now = timezone.now()
+    changes = {"status": to_status, "updated_at": now}
+    # the WHERE repeats the rules so databases without row locks stay honest
+    conditions = Q(status__in=allowed_from(to_status))
+    if to_status == "shipped":
+        changes["shipped_at"] = Coalesce("shipped_at", Value(now))
+        conditions &= Q(is_paid=True)
+    if to_status == "cancelled":
+        # cancel => unpaid
+        changes["is_paid"] = False
+
+    updated = (
+        Order.objects
+        .filter(conditions, pk__in=[order.id for order in orders])
+        .update(**changes)
+    )
+    if updated != len(orders):
+        raise TransitionError("Orders changed while being updated; please retry.")
+
+    OrderStatusHistory.objects.bulk_create(
+        [
+            OrderStatusHistory(
+                order_id=order.id,
+                from_status=order.status,
+                to_status=to_status,
+                changed_by=changed_by,
+            )
+            for order in orders
+        ],
+        batch_size=1000,
+    )
+    if to_status == "cancelled":
+        record_payment_changes([order for order in orders if order.is_paid], paid=False)
+    # queryset updates skip post_save
+    order_status_changed.send(
+        sender=Order,
+        order_ids=[order.id for order in orders],
+        user_ids={order.user_id for order in orders},
+        to_status=to_status,
+    )
+
+
+def transition_order(order, to_status, changed_by=None):
+    """Move one order or raise ``TransitionError``; ``order`` is refreshed."""
+    result = transition_orders([order.pk], to_status, changed_by)
+    if result["rejected"]:
+        raise TransitionError(result["rejected"][0]["detail"])
+    order.refresh_from_db()
+
+
+def set_paid(order, paid, payment_id=None):
+    """
+    Flip ``order.is_paid`` and keep the sales rollup in step. ``order``
+    must be locked (``select_for_update``) by the caller.
+    """
+    if order.status in FINAL_STATUSES:
+        raise TransitionError(f"Order is already {order.status} and cannot be modified")
+    if order.is_paid == paid:
+        return
+    order.is_paid = paid
+    fields = ["is_paid", "updated_at"]
+    if payment_id is not None:
+        order.payment_id = payment_id
+        fields.append("payment_id")
+    order.save(update_fields=fields)
+    record_payment_change(order, paid=paid)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild DailySalesRollup from the orders table."
+
+    def handle(self, *args, **options):
+        days = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt sales rollup for {days} days."))
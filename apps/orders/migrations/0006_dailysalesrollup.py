@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-17 11:30
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def populate_rollup(apps, schema_editor):
+    from apps.orders.rollups import rebuild_rollups
+
+    rebuild_rollups(
+        apps.get_model("orders", "Order"),
+        apps.get_model("orders", "OrderItem"),
+        apps.get_model("orders", "DailySalesRollup"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_order_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('orders', models.IntegerField(default=0)),
+                ('paid_orders', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('units', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
@@ -44,6 +44,10 @@ class Order(models.Model):
     shipped_at = models.DateTimeField(null=True, blank=True)
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["user", "created_at"]),
+        ]
     def __str__(self):
         return f"Order #{self.id} - {self.user}"
 class OrderItem(models.Model):
@@ -70,3 +74,46 @@ class OrderItem(models.Model):
         super().save(*args, **kwargs)
     def __str__(self):
         return f"{self.product.name} x {self.quantity}"
+
+class DailySalesRollup(models.Model):
+    """
+    Per-day totals for the admin dashboard, keyed by order creation date.
+    Kept current by ``orders.rollups``; rebuild with
+    ``manage.py rebuild_sales_rollup``.
+    """
+    date = models.DateField(unique=True)
+    orders = models.IntegerField(default=0)
+    paid_orders = models.IntegerField(default=0)
+    revenue = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal("0.00")
+    )
+    units = models.IntegerField(default=0)
+    class Meta:
+        ordering = ["date"]
+    def __str__(self):
+        return f"{self.date}: {self.paid_orders}/{self.orders} paid, {self.revenue}"
+
+class OrderStatusHistory(models.Model):
+    """One row per status change, written by ``orders.lifecycle``."""
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name="status_history"
+    )
+    from_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    class Meta:
+        ordering = ["created_at", "id"]
+        verbose_name_plural = "order status history"
+    def __str__(self):
+        return f"Order #{self.order_id}: {self.from_status} -> {self.to_status}"
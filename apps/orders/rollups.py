@@ -0,0 +1,106 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailySalesRollup, Order, OrderItem
+
+
+def rollup_date(order):
+    # matches TruncDate("created_at") in the current time zone
+    return timezone.localdate(order.created_at)
+
+
+def _apply(day, **deltas):
+    # one UPDATE once the day exists; the INSERT runs once per day
+    updated = DailySalesRollup.objects.filter(date=day).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            DailySalesRollup.objects.create(date=day, **deltas)
+    except IntegrityError:
+        # another transaction inserted the day first
+        _apply(day, **deltas)
+
+
+def record_order_created(order, units):
+    """
+    Count a new order once its transaction commits, so concurrent checkouts
+    never queue on the day's row lock; ``rebuild_rollups`` repairs a day
+    whose process died in between.
+    """
+    day = rollup_date(order)
+    transaction.on_commit(lambda: _apply(day, orders=1, units=units))
+
+
+def record_payment_change(order, paid):
+    """Call when ``order.is_paid`` flips; ``paid`` is the new value."""
+    sign = 1 if paid else -1
+    _apply(
+        rollup_date(order),
+        paid_orders=sign,
+        revenue=sign * order.total_amount,
+    )
+
+
+def record_payment_changes(orders, paid):
+    """``record_payment_change`` for many orders, one UPDATE per day."""
+    sign = 1 if paid else -1
+    days = defaultdict(lambda: [0, Decimal("0.00")])
+    for order in orders:
+        day = days[rollup_date(order)]
+        day[0] += sign
+        day[1] += sign * order.total_amount
+    for day, (count, revenue) in days.items():
+        _apply(day, paid_orders=count, revenue=revenue)
+
+
+def rebuild_rollups(order_model=Order, item_model=OrderItem, rollup_model=DailySalesRollup):
+    """Recompute every day from orders with two grouped queries."""
+    days = defaultdict(lambda: {
+        "orders": 0,
+        "paid_orders": 0,
+        "revenue": Decimal("0.00"),
+        "units": 0,
+    })
+
+    order_rows = (
+        order_model.objects
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(
+            orders=Count("id"),
+            paid_orders=Count("id", filter=Q(is_paid=True)),
+            revenue=Sum("total_amount", filter=Q(is_paid=True)),
+        )
+        .order_by()
+    )
+    for row in order_rows:
+        day = days[row["day"]]
+        day["orders"] = row["orders"]
+        day["paid_orders"] = row["paid_orders"]
+        day["revenue"] = row["revenue"] or Decimal("0.00")
+
+    unit_rows = (
+        item_model.objects
+        .annotate(day=TruncDate("order__created_at"))
+        .values("day")
+        .annotate(units=Sum("quantity"))
+        .order_by()
+    )
+    for row in unit_rows:
+        days[row["day"]]["units"] = row["units"] or 0
+
+    with transaction.atomic():
+        rollup_model.objects.all().delete()
+        rollup_model.objects.bulk_create(
+            [rollup_model(date=day, **values) for day, values in days.items()],
+            batch_size=1000,
+        )
+    return len(days)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from ..lifecycle import TARGET_STATUSES
 from ..models import Order, OrderItem
 
 
@@ -72,9 +73,12 @@ class AdminOrderSerializer(serializers.ModelSerializer):
             "items",
         ]
 
-    def validate(self, attrs):
-        if self.instance:
-            new_status = attrs.get('status')
-            if new_status == 'shipped' and not self.instance.is_paid:
-                raise serializers.ValidationError({"status": "Cannot ship an unpaid order."})
-        return attrs
+
+class OrderBulkStatusSerializer(serializers.Serializer):
+    order_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=5000,
+    )
+    status = serializers.ChoiceField(choices=sorted(TARGET_STATUSES))
+
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.core.sparse import SparseFieldsetMixin
 from ..models import Order, OrderItem
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -50,7 +51,7 @@ class OrderItemSerializer(serializers.ModelSerializer):
 
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, read_only=True)
 
     class Meta:
@@ -0,0 +1,94 @@
+from functools import reduce
+from operator import or_
+
+from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from apps.products.cache import bump_catalog_version
+from apps.products.models import Product
+
+
+# =======================
+# STOCK RESERVATION
+# =======================
+class InsufficientStock(Exception):
+    def __init__(self, shortages):
+        self.shortages = shortages
+        super().__init__(self.detail)
+
+    @property
+    def detail(self):
+        return "; ".join(
+            f"{line['name']} has only {line['available']} left"
+            for line in self.shortages
+        )
+
+
+def _shortages(products, quantities):
+    return [
+        {
+            "product_id": product.id,
+            "name": product.name,
+            "requested": quantities[product.id],
+            "available": product.stock,
+        }
+        for product in products
+        if product.stock < quantities[product.id]
+    ]
+
+
+def reserve_stock(quantities):
+    """
+    Decrement stock for ``{product_id: quantity}`` or raise
+    ``InsufficientStock`` listing every short line.
+
+    Rows are locked in primary-key order so concurrent checkouts cannot
+    deadlock, then the whole cart is decremented by a single conditional
+    UPDATE. Must run inside ``transaction.atomic``; callers roll back on
+    ``InsufficientStock``. Returns the locked products keyed by id.
+
+    The catalog cache is only invalidated when a product sells out, so
+    checkouts do not flush it on every order.
+    """
+    products = list(
+        Product.objects
+        .select_for_update()
+        .filter(pk__in=quantities)
+        .order_by("pk")
+        .only("id", "name", "price", "stock")
+    )
+
+    shortages = _shortages(products, quantities)
+    if shortages:
+        raise InsufficientStock(shortages)
+
+    # stock >= qty in the WHERE keeps databases without row locks honest
+    updated = (
+        Product.objects
+        .filter(reduce(or_, (
+            Q(pk=product_id, stock__gte=quantity)
+            for product_id, quantity in quantities.items()
+        )))
+        .update(
+            stock=F("stock") - Case(
+                *[
+                    When(pk=product_id, then=Value(quantity))
+                    for product_id, quantity in quantities.items()
+                ],
+                output_field=models.PositiveIntegerField(),
+            ),
+            updated_at=timezone.now(),
+        )
+    )
+    if updated != len(quantities):
+        fresh = Product.objects.filter(pk__in=quantities).only("id", "name", "stock")
+        raise InsufficientStock(_shortages(fresh, quantities))
+
+    for product in products:
+        product.stock -= quantities[product.id]
+    # cached catalog pages may show a stock count a few orders old, but
+    # never offer a product that has sold out
+    if any(product.stock == 0 for product in products):
+        bump_catalog_version()
+    return {product.id: product for product in products}
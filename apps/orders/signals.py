@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+
+# sent by orders.lifecycle after a queryset UPDATE, which skips post_save;
+# kwargs: order_ids, user_ids, to_status
+order_status_changed = Signal()
@@ -1,3 +1,387 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from unittest import skipUnless
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.cart.models import CartItem
+from apps.products.models import Product
+from .models import DailySalesRollup, Order, OrderItem, OrderStatusHistory
+
+
+SHIPPING = {
+    "full_name": "Test Buyer",
+    "phone": "9876543210",
+    "address": "1 Test Street",
+    "city": "Kochi",
+    "pincode": "682001",
+}
+
+
+def make_product(name, stock, price="100.00"):
+    return Product.objects.create(
+        name=name,
+        price=Decimal(price),
+        image="products/test.jpg",
+        stock=stock,
+    )
+
+
+def make_user(index):
+    return User.objects.create_user(
+        email=f"buyer{index}@example.com",
+        password="pass12345",
+        name=f"Buyer {index}",
+    )
+
+
+class CreateOrderStockTests(TestCase):
+    def setUp(self):
+        self.user = make_user(0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_reports_every_short_line(self):
+        cone = make_product("Cone", stock=1)
+        tub = make_product("Tub", stock=0)
+        bar = make_product("Bar", stock=10)
+        for product, quantity in ((cone, 2), (tub, 1), (bar, 1)):
+            CartItem.objects.create(user=self.user, product=product, quantity=quantity)
+
+        response = self.client.post("/api/orders/create/", SHIPPING, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        short = {line["product_id"]: line for line in response.data["items"]}
+        self.assertEqual(set(short), {cone.id, tub.id})
+        self.assertEqual(short[cone.id]["available"], 1)
+        self.assertFalse(Order.objects.exists())
+        bar.refresh_from_db()
+        self.assertEqual(bar.stock, 10)
+
+    def checkout_queries(self, lines):
+        for index in range(lines):
+            product = make_product(f"Flavour {lines}-{index}", stock=5)
+            CartItem.objects.create(user=self.user, product=product, quantity=2)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/orders/create/", SHIPPING, format="json")
+        self.assertEqual(response.status_code, 201)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_cart_size(self):
+        single = self.checkout_queries(1)
+        many = self.checkout_queries(30)
+        self.assertEqual(single, many)
+
+        order = Order.objects.latest("id")
+        items = OrderItem.objects.filter(order=order)
+        self.assertEqual(items.count(), 30)
+        self.assertEqual(order.total_amount, sum(item.subtotal for item in items))
+
+    def test_rollup_counts_the_order_after_commit(self):
+        cone = make_product("Cone", stock=5)
+        CartItem.objects.create(user=self.user, product=cone, quantity=2)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post("/api/orders/create/", SHIPPING, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(DailySalesRollup.objects.exists())
+
+        for callback in callbacks:
+            callback()
+        rollup = DailySalesRollup.objects.get()
+        self.assertEqual((rollup.orders, rollup.units), (1, 2))
+
+
+class ReorderTests(TestCase):
+    def setUp(self):
+        self.user = make_user(0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_restores_available_lines_and_reports_the_rest(self):
+        cone = make_product("Cone", stock=10)
+        tub = make_product("Tub", stock=3)
+        bar = make_product("Bar", stock=10)
+        for product in (cone, tub, bar):
+            CartItem.objects.create(user=self.user, product=product, quantity=2)
+        order_id = self.client.post("/api/orders/create/", SHIPPING, format="json").data["order_id"]
+        Product.objects.filter(pk=bar.pk).update(is_active=False)
+
+        response = self.client.post(f"/api/orders/{order_id}/reorder/")
+
+        self.assertEqual(response.status_code, 200)
+        quantities = dict(CartItem.objects.filter(user=self.user).values_list("product_id", "quantity"))
+        # the order left one tub in stock
+        self.assertEqual(quantities, {cone.id: 2, tub.id: 1})
+        skipped = {line["product_id"]: line for line in response.data["skipped"]}
+        self.assertEqual(skipped[tub.id]["reason"], "insufficient_stock")
+        self.assertEqual(skipped[tub.id]["restored"], 1)
+        self.assertEqual(skipped[bar.id]["reason"], "unavailable")
+
+    def test_other_users_order_is_not_found(self):
+        other = make_user(1)
+        order = Order.objects.create(user=other, total_amount=0, **SHIPPING)
+        response = self.client.post(f"/api/orders/{order.id}/reorder/")
+        self.assertEqual(response.status_code, 404)
+
+
+class OrderLifecycleTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com",
+            password="pass12345",
+            name="Admin",
+        )
+        self.user = make_user(0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def make_order(self, status="pending", is_paid=True):
+        return Order.objects.create(
+            user=self.user,
+            total_amount=Decimal("100.00"),
+            status=status,
+            is_paid=is_paid,
+            **SHIPPING,
+        )
+
+    def test_bulk_ship_moves_eligible_orders_in_one_update(self):
+        paid = [self.make_order() for _ in range(3)]
+        unpaid = self.make_order(is_paid=False)
+        delivered = self.make_order(status="delivered")
+        ids = [order.id for order in paid] + [unpaid.id, delivered.id, 999999]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/admin/orders/bulk-status/",
+                {"order_ids": ids, "status": "shipped"},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.data["updated"]), [order.id for order in paid])
+        rejected = {line["id"] for line in response.data["rejected"]}
+        self.assertEqual(rejected, {unpaid.id, delivered.id, 999999})
+        updates = [q for q in queries.captured_queries if q["sql"].startswith('UPDATE "orders_order"')]
+        self.assertEqual(len(updates), 1)
+        shipped = Order.objects.filter(status="shipped")
+        self.assertEqual(shipped.count(), 3)
+        self.assertFalse(shipped.filter(shipped_at__isnull=True).exists())
+        self.assertEqual(
+            OrderStatusHistory.objects.filter(from_status="pending", to_status="shipped").count(), 3
+        )
+
+    def test_patch_can_pay_and_ship_together(self):
+        order = self.make_order(is_paid=False)
+        response = self.client.patch(f"/api/admin/orders/{order.id}/update/", {"status": "shipped"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.patch(
+            f"/api/admin/orders/{order.id}/update/",
+            {"status": "shipped", "is_paid": True},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "shipped")
+        self.assertTrue(response.data["is_paid"])
+
+    def test_cancelling_a_paid_order_reverses_its_revenue(self):
+        order = self.make_order(is_paid=False)
+        url = f"/api/admin/orders/{order.id}/update/"
+        response = self.client.patch(url, {"is_paid": True}, format="json")
+        self.assertEqual(response.status_code, 200)
+        rollup = DailySalesRollup.objects.get()
+        self.assertEqual((rollup.paid_orders, rollup.revenue), (1, Decimal("100.00")))
+
+        response = self.client.patch(url, {"status": "cancelled"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["is_paid"])
+        rollup.refresh_from_db()
+        self.assertEqual((rollup.paid_orders, rollup.revenue), (0, Decimal("0.00")))
+
+        response = self.client.patch(url, {"status": "pending"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class OrderExportTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser(
+            email="admin@example.com",
+            password="pass12345",
+            name="Admin",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.user = make_user(0)
+        self.product = make_product("Cone", stock=10)
+        self.today = self.make_order("pending", days_ago=0)
+        self.old = self.make_order("delivered", days_ago=10, full_name="=HYPERLINK(\"http://x\")")
+
+    def make_order(self, status, days_ago, **fields):
+        order = Order.objects.create(
+            user=self.user,
+            total_amount=Decimal("200.00"),
+            status=status,
+            **{**SHIPPING, **fields},
+        )
+        OrderItem.objects.create(order=order, product=self.product, quantity=2, price=Decimal("100.00"))
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        return order
+
+    def export(self, **params):
+        response = self.client.get("/api/admin/orders/export/", params)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_filters_by_status_and_escapes_formulas(self):
+        rows = list(csv.DictReader(io.StringIO(self.export(status="delivered"))))
+
+        self.assertEqual([row["id"] for row in rows], [str(self.old.id)])
+        self.assertEqual(rows[0]["full_name"], "'=HYPERLINK(\"http://x\")")
+        self.assertEqual(rows[0]["product_name"], "Cone")
+
+    def test_ndjson_filters_by_date(self):
+        since = (timezone.localdate() - timedelta(days=1)).isoformat()
+        lines = self.export(file_format="ndjson", date_from=since).splitlines()
+
+        orders = [json.loads(line) for line in lines]
+        self.assertEqual([order["id"] for order in orders], [self.today.id])
+        self.assertEqual(orders[0]["items"][0]["quantity"], 2)
+        # NDJSON is not opened by spreadsheets and keeps values as entered
+        until = (timezone.localdate() - timedelta(days=5)).isoformat()
+        old = json.loads(self.export(file_format="ndjson", date_to=until))
+        self.assertEqual(old["full_name"], self.old.full_name)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get("/api/admin/orders/export/", {"file_format": "xlsx"})
+        self.assertEqual(response.status_code, 400)
+
+
+class IdempotentCheckoutTests(TestCase):
+    def setUp(self):
+        self.user = make_user(0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.product = make_product("Cone", stock=10)
+
+    def checkout(self, key, data=SHIPPING):
+        return self.client.post(
+            "/api/orders/create/", data, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_repeated_key_replays_the_first_response(self):
+        CartItem.objects.create(user=self.user, product=self.product, quantity=2)
+        first = self.checkout("checkout-1")
+        CartItem.objects.create(user=self.user, product=self.product, quantity=2)
+        second = self.checkout("checkout-1")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_key_reused_for_a_different_body_is_rejected(self):
+        CartItem.objects.create(user=self.user, product=self.product, quantity=2)
+        self.assertEqual(self.checkout("checkout-1").status_code, 201)
+
+        response = self.checkout("checkout-1", {**SHIPPING, "city": "Kollam"})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failed_request_releases_the_key(self):
+        self.assertEqual(self.checkout("checkout-1").status_code, 400)
+
+        CartItem.objects.create(user=self.user, product=self.product, quantity=2)
+        response = self.checkout("checkout-1")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", response)
+
+
+@skipUnless(connection.vendor == "postgresql", "needs concurrent connections")
+class IdempotentCheckoutConcurrencyTests(TransactionTestCase):
+    retries = 5
+
+    def test_concurrent_duplicates_create_one_order(self):
+        user = make_user(0)
+        product = make_product("Cone", stock=10)
+        CartItem.objects.create(user=user, product=product, quantity=2)
+
+        barrier = threading.Barrier(self.retries)
+        results = []
+        results_lock = threading.Lock()
+
+        def checkout():
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                barrier.wait()
+                response = client.post(
+                    "/api/orders/create/", SHIPPING, format="json", HTTP_IDEMPOTENCY_KEY="checkout-1"
+                )
+                with results_lock:
+                    results.append((response.status_code, response.data.get("order_id")))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=checkout) for _ in range(self.retries)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(Order.objects.count(), 1)
+        order_id = Order.objects.get().id
+        self.assertEqual(results, [(201, order_id)] * self.retries)
+
+
+@skipUnless(connection.vendor == "postgresql", "row locks need PostgreSQL")
+class CreateOrderConcurrencyTests(TransactionTestCase):
+    buyers = 20
+    stock = 5
+
+    def test_concurrent_checkouts_never_oversell(self):
+        product = make_product("Last Scoop", stock=self.stock)
+        users = [make_user(i) for i in range(self.buyers)]
+        CartItem.objects.bulk_create(
+            CartItem(user=user, product=product, quantity=1) for user in users
+        )
+
+        barrier = threading.Barrier(self.buyers)
+        results = []
+        results_lock = threading.Lock()
+
+        def checkout(user):
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                barrier.wait()
+                response = client.post("/api/orders/create/", SHIPPING, format="json")
+                with results_lock:
+                    results.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=checkout, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        product.refresh_from_db()
+        self.assertEqual(product.stock, 0)
+        self.assertEqual(results.count(201), self.stock)
+        self.assertEqual(results.count(400), self.buyers - self.stock)
+        self.assertEqual(Order.objects.count(), self.stock)
@@ -4,6 +4,8 @@ from apps.orders.views.admin_views import (
     AdminOrderDetailView,
     AdminOrderStatsView,
     AdminOrderUpdateView,
+    AdminOrderExportView,
+    AdminOrderBulkStatusView,
 )
 
 urlpatterns = [
@@ -11,4 +13,6 @@ urlpatterns = [
     path("admin/orders/<int:id>/", AdminOrderDetailView.as_view()),
     path("admin/orders/<int:id>/update/", AdminOrderUpdateView.as_view()),
     path("admin/orders/stats/", AdminOrderStatsView.as_view()),
+    path("admin/orders/export/", AdminOrderExportView.as_view()),
+    path("admin/orders/bulk-status/", AdminOrderBulkStatusView.as_view()),
 ]
@@ -8,11 +8,27 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
-from django.db import models
-from django.db.models import Sum
+import csv
+import json
+from datetime import datetime, time, timedelta
 
-from ..models import Order, OrderItem
-from ..serializers.admin_serializers import AdminOrderSerializer
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Prefetch, Sum
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.core.pagination import OptionalKeysetPagination
+from ..models import Order, OrderItem, DailySalesRollup
+from ..lifecycle import (
+    FINAL_STATUSES,
+    TransitionError,
+    set_paid,
+    transition_order,
+    transition_orders,
+)
+from ..serializers.admin_serializers import AdminOrderSerializer, OrderBulkStatusSerializer
 
 
 # =======================
@@ -27,6 +43,7 @@ class AdminOrderListView(ListAPIView):
     )
     serializer_class = AdminOrderSerializer
     permission_classes = [IsAdminUser]
+    pagination_class = OptionalKeysetPagination
 
 
 # =======================
@@ -48,71 +65,32 @@ class AdminOrderDetailView(RetrieveAPIView):
 # (STATUS / PAYMENT)
 # =======================
 class AdminOrderUpdateView(UpdateAPIView):
-    queryset = Order.objects.all()
+    queryset = Order.objects.select_for_update()
     serializer_class = AdminOrderSerializer
     permission_classes = [IsAdminUser]
     lookup_field = "id"
 
+    # every write goes through the lifecycle rules
+    def put(self, request, *args, **kwargs):
+        return self.patch(request, *args, **kwargs)
+
+    @transaction.atomic
     def patch(self, request, *args, **kwargs):
         order = self.get_object()
-
         new_status = request.data.get("status")
         new_paid = request.data.get("is_paid")
 
-        allowed_status = [
-            "pending",
-            "shipped",
-            "delivered",
-            "cancelled",
-            "paid",
-        ]
-
-        # ❌ block changes after final states
-        if order.status in ["delivered", "cancelled"]:
-            return Response(
-                {"detail": f"Order is already {order.status} and cannot be modified"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        # ✅ STATUS UPDATE VALIDATION (State Machine)
-        if new_status:
-            if new_status not in allowed_status:
-                return Response(
-                    {"detail": f"Invalid status: {new_status}"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            # Define valid transitions
-            valid_next_states = {
-                "pending": ["shipped", "delivered", "cancelled"],
-                "shipped": ["delivered", "cancelled"],
-                "paid": ["shipped", "delivered", "cancelled"],
-            }
-
-            if new_status != order.status: # Only validate if status is actually changing
-                if order.status in valid_next_states:
-                    if new_status not in valid_next_states[order.status]:
-                        return Response(
-                            {"detail": f"Cannot transition from {order.status} to {new_status}"},
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-                
-                order.status = new_status
-
-            # cancel ⇒ unpaid (keep existing logic)
-            if new_status == "cancelled":
-                order.is_paid = False
-
-            # ✅ Set shipped_at logic
-            if new_status == "shipped" and not order.shipped_at:
-                from django.utils import timezone
-                order.shipped_at = timezone.now()
-
-        # ✅ PAYMENT UPDATE (OPTIONAL)
-        if new_paid is not None:
-            order.is_paid = bool(new_paid)
-
-        order.save()
+        try:
+            # payment first, so "paid and shipped" works in one request
+            if new_paid is not None:
+                set_paid(order, bool(new_paid))
+            if new_status:
+                transition_order(order, new_status, changed_by=request.user)
+            elif order.status in FINAL_STATUSES:
+                raise TransitionError(f"Order is already {order.status} and cannot be modified")
+        except TransitionError as exc:
+            transaction.set_rollback(True)
+            return Response({"detail": exc.detail}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(
             AdminOrderSerializer(order).data,
@@ -120,6 +98,32 @@ class AdminOrderUpdateView(UpdateAPIView):
         )
 
 
+# =======================
+# ADMIN – BULK STATUS
+# =======================
+class AdminOrderBulkStatusView(APIView):
+    """
+    Move many orders to one status: ``{"order_ids": [...], "status": "shipped"}``.
+
+    Eligible orders change together in a single conditional UPDATE; the
+    rest are listed under ``rejected`` with the reason.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        serializer = OrderBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = transition_orders(
+                serializer.validated_data["order_ids"],
+                serializer.validated_data["status"],
+                changed_by=request.user,
+            )
+        except TransitionError as exc:
+            return Response({"detail": exc.detail}, status=status.HTTP_409_CONFLICT)
+        return Response(result, status=status.HTTP_200_OK)
+
+
 # =======================
 # ADMIN – DASHBOARD STATS
 # =======================
@@ -127,55 +131,33 @@ class AdminOrderStatsView(APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        total_orders = Order.objects.count()
-        paid_orders = Order.objects.filter(is_paid=True).count()
-
-        total_revenue = (
-            Order.objects
-            .filter(is_paid=True)
-            .aggregate(total=Sum("total_amount"))["total"]
-            or 0
-        )
-
-        total_products_sold = (
-            OrderItem.objects
-            .aggregate(total=Sum("quantity"))["total"]
-            or 0
+        # every figure comes from the per-day rollup, never the orders table
+        totals = DailySalesRollup.objects.aggregate(
+            orders=Sum("orders"),
+            paid_orders=Sum("paid_orders"),
+            revenue=Sum("revenue"),
+            units=Sum("units"),
         )
 
         # Graph Data (Last 7 Days)
-        from django.utils import timezone
-        from django.db.models.functions import TruncDate
-        
-        last_7_days = timezone.now().date() - timezone.timedelta(days=6)
-        
-        daily_stats = (
-            Order.objects
-            .filter(is_paid=True, created_at__date__gte=last_7_days)
-            .annotate(date=TruncDate('created_at'))
-            .values('date')
-            .annotate(
-                orders=models.Count('id'),
-                revenue=Sum('total_amount')
-            )
-            .order_by('date')
-        )
+        last_7_days = timezone.localdate() - timezone.timedelta(days=6)
+        stats_dict = {
+            row.date: row
+            for row in DailySalesRollup.objects.filter(date__gte=last_7_days)
+        }
 
         # Format for frontend
         graph_data = []
-        stats_dict = {str(stat['date']): stat for stat in daily_stats}
-        
         for i in range(7):
             date_obj = last_7_days + timezone.timedelta(days=i)
-            date_str = str(date_obj)
             day_name = date_obj.strftime("%a") # Mon, Tue...
-            
-            if date_str in stats_dict:
-                entry = stats_dict[date_str]
+
+            if date_obj in stats_dict:
+                entry = stats_dict[date_obj]
                 graph_data.append({
                     "name": day_name,
-                    "orders": entry['orders'],
-                    "revenue": float(entry['revenue'] or 0)
+                    "orders": entry.paid_orders,
+                    "revenue": float(entry.revenue)
                 })
             else:
                 graph_data.append({
@@ -185,9 +167,168 @@ class AdminOrderStatsView(APIView):
                 })
 
         return Response({
-            "total_orders": total_orders,
-            "paid_orders": paid_orders,
-            "total_products_sold": total_products_sold,
-            "total_revenue": total_revenue,
+            "total_orders": totals["orders"] or 0,
+            "paid_orders": totals["paid_orders"] or 0,
+            "total_products_sold": totals["units"] or 0,
+            "total_revenue": totals["revenue"] or 0,
             "graph_data": graph_data
         })
+
+
+# =======================
+# ADMIN – ORDER EXPORT
+# =======================
+class Echo:
+    """File-like object whose write() hands the line back to the caller."""
+    def write(self, value):
+        return value
+
+
+# a spreadsheet treats cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_safe(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class AdminOrderExportView(APIView):
+    """
+    Stream orders with their items as CSV (one row per item) or NDJSON
+    (one order per line). Rows come from a server-side cursor in chunks,
+    so memory stays flat however many orders match.
+
+    Query params: file_format=csv|ndjson, date_from, date_to (YYYY-MM-DD,
+    inclusive), status.
+    """
+    permission_classes = [IsAdminUser]
+    chunk_size = 500
+
+    ORDER_FIELDS = [
+        "id",
+        "created_at",
+        "status",
+        "is_paid",
+        "payment_id",
+        "total_amount",
+        "user_email",
+        "full_name",
+        "phone",
+        "address",
+        "city",
+        "pincode",
+    ]
+    ITEM_FIELDS = ["product_id", "product_name", "quantity", "price", "subtotal"]
+
+    def get(self, request):
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in ("csv", "ndjson"):
+            return Response(
+                {"detail": "file_format must be csv or ndjson"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filters = {}
+        for param, lookup, shift in (
+            ("date_from", "created_at__gte", 0),
+            ("date_to", "created_at__lt", 1),
+        ):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            day = parse_date(value)
+            if day is None:
+                return Response(
+                    {"detail": f"{param} must be YYYY-MM-DD"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # whole local days, compared on the raw column so the index is usable
+            filters[lookup] = timezone.make_aware(
+                datetime.combine(day + timedelta(days=shift), time.min)
+            )
+
+        order_status = request.query_params.get("status")
+        if order_status:
+            if order_status not in dict(Order.STATUS_CHOICES):
+                return Response(
+                    {"detail": f"Invalid status: {order_status}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            filters["status"] = order_status
+
+        orders = (
+            Order.objects
+            .filter(**filters)
+            .select_related("user")
+            .only(*[f for f in self.ORDER_FIELDS if f != "user_email"], "user", "user__email")
+            .prefetch_related(Prefetch(
+                "items",
+                queryset=(
+                    OrderItem.objects
+                    .select_related("product")
+                    .only("order", "product", "product__name", "quantity", "price", "subtotal")
+                ),
+            ))
+            .order_by("created_at", "id")
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+        if file_format == "csv":
+            rows = self.csv_rows(orders)
+            content_type = "text/csv"
+        else:
+            rows = self.ndjson_rows(orders)
+            content_type = "application/x-ndjson"
+
+        response = StreamingHttpResponse(rows, content_type=content_type)
+        stamp = timezone.localdate().isoformat()
+        response["Content-Disposition"] = f'attachment; filename="orders-{stamp}.{file_format}"'
+        return response
+
+    def order_values(self, order):
+        return {
+            "id": order.id,
+            "created_at": order.created_at.isoformat(),
+            "status": order.status,
+            "is_paid": order.is_paid,
+            "payment_id": order.payment_id,
+            "total_amount": order.total_amount,
+            "user_email": order.user.email,
+            "full_name": order.full_name,
+            "phone": order.phone,
+            "address": order.address,
+            "city": order.city,
+            "pincode": order.pincode,
+        }
+
+    def item_values(self, item):
+        return {
+            "product_id": item.product_id,
+            "product_name": item.product.name,
+            "quantity": item.quantity,
+            "price": item.price,
+            "subtotal": item.subtotal,
+        }
+
+    def csv_rows(self, orders):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.ORDER_FIELDS + self.ITEM_FIELDS)
+        for order in orders:
+            values = self.order_values(order)
+            order_row = [csv_safe(values[field]) for field in self.ORDER_FIELDS]
+            items = list(order.items.all())
+            if not items:
+                yield writer.writerow(order_row + [""] * len(self.ITEM_FIELDS))
+            for item in items:
+                item_values = self.item_values(item)
+                yield writer.writerow(
+                    order_row + [csv_safe(item_values[field]) for field in self.ITEM_FIELDS]
+                )
+
+    def ndjson_rows(self, orders):
+        for order in orders:
+            values = self.order_values(order)
+            values["items"] = [self.item_values(item) for item in order.items.all()]
+            yield json.dumps(values, cls=DjangoJSONEncoder) + "\n"
@@ -3,18 +3,27 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from rest_framework.pagination import PageNumberPagination
+from apps.core.idempotency import idempotent
+from apps.core.pagination import OptionalKeysetPagination
+from apps.core.sparse import sparse_fields, wants
+from apps.products.queries import order_item_products
 from decimal import Decimal
 from ..models import Order, OrderItem
 from ..serializers.user_serializers import OrderSerializer
+from ..services import reserve_stock, InsufficientStock
+from ..rollups import record_order_created
 from apps.cart.models import CartItem
+from apps.cart.serializers import CartItemSerializer
+from apps.cart.services import apply_cart_operations
+from apps.products.queries import with_product_card
 class CreateOrderView(APIView):
     permission_classes = [IsAuthenticated]
+    @idempotent("orders.create")
     @transaction.atomic
     def post(self, request):
         user = request.user
-        cart_items = CartItem.objects.select_related("product").filter(user=user)
-        if not cart_items.exists():
+        cart_items = list(CartItem.objects.filter(user=user))
+        if not cart_items:
             return Response(
                 {"detail": "Cart is empty"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -29,6 +38,29 @@ class CreateOrderView(APIView):
                 {"detail": "All fields are required"},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        try:
+            products = reserve_stock(
+                {item.product_id: item.quantity for item in cart_items}
+            )
+        except InsufficientStock as exc:
+            transaction.set_rollback(True)
+            return Response(
+                {"detail": exc.detail, "items": exc.shortages},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # bulk_create skips OrderItem.save, so subtotals are set here
+        order_items = []
+        total_amount = Decimal("0.00")
+        for item in cart_items:
+            price = products[item.product_id].price
+            subtotal = price * item.quantity
+            order_items.append(OrderItem(
+                product_id=item.product_id,
+                quantity=item.quantity,
+                price=price,
+                subtotal=subtotal,
+            ))
+            total_amount += subtotal
         order = Order.objects.create(
             user=user,
             full_name=full_name,
@@ -36,34 +68,13 @@ class CreateOrderView(APIView):
             address=address,
             city=city,
             pincode=pincode,
-            total_amount=Decimal("0.00"),
+            total_amount=total_amount,
         )
-
-        total_amount = Decimal("0.00")
-        for item in cart_items:
-            product = item.product
-            quantity = item.quantity
-            if product.stock < quantity:
-                transaction.set_rollback(True)
-                return Response(
-                    {"detail": f"{product.name} has only {product.stock} left"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            price = product.price
-            subtotal = price * quantity
-            OrderItem.objects.create(
-                order=order,
-                product=product,
-                quantity=quantity,
-                price=price,
-                subtotal=subtotal,
-            )
-            product.stock -= quantity
-            product.save()
-            total_amount += subtotal
-        order.total_amount = total_amount
-        order.save()
-        cart_items.delete()
+        for order_item in order_items:
+            order_item.order = order
+        OrderItem.objects.bulk_create(order_items)
+        CartItem.objects.filter(user=user).delete()
+        record_order_created(order, units=sum(item.quantity for item in cart_items))
         return Response(
             {
                 "order_id": order.id,
@@ -75,14 +86,10 @@ class CreateOrderView(APIView):
 class MyOrdersView(APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request):
-        orders = (
-            Order.objects
-            .filter(user=request.user)
-            .prefetch_related("items__product")
-            .order_by("-created_at")
-        )
-        paginator = PageNumberPagination()
-        paginator.page_size = 10
+        orders = Order.objects.filter(user=request.user).order_by("-created_at")
+        if wants(sparse_fields(request), "items"):
+            orders = orders.prefetch_related(order_item_products())
+        paginator = OptionalKeysetPagination()
         page = paginator.paginate_queryset(orders, request)
         serializer = OrderSerializer(page, many=True, context={'request': request})
         return paginator.get_paginated_response(serializer.data)
@@ -90,7 +97,7 @@ class OrderDetailView(APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request, order_id):
         try:
-            order = Order.objects.prefetch_related("items__product").get(
+            order = Order.objects.prefetch_related(order_item_products()).get(
                 id=order_id,
                 user=request.user
             )
@@ -102,3 +109,52 @@ class OrderDetailView(APIView):
 
         serializer = OrderSerializer(order, context={'request': request})
         return Response(serializer.data)
+class ReorderView(APIView):
+    permission_classes = [IsAuthenticated]
+    def post(self, request, order_id):
+        if not Order.objects.filter(id=order_id, user=request.user).exists():
+            return Response(
+                {"detail": "Order not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        # current stock and availability come along in the same query
+        lines = (
+            OrderItem.objects
+            .filter(order_id=order_id)
+            .values(
+                "product_id",
+                "quantity",
+                "product__name",
+                "product__stock",
+                "product__is_active",
+            )
+        )
+        operations = []
+        skipped = []
+        for line in lines:
+            requested = line["quantity"]
+            restored = min(requested, line["product__stock"]) if line["product__is_active"] else 0
+            if restored:
+                operations.append({
+                    "product_id": line["product_id"],
+                    "quantity": restored,
+                    "op": "add",
+                })
+            if restored < requested:
+                skipped.append({
+                    "product_id": line["product_id"],
+                    "name": line["product__name"],
+                    "requested": requested,
+                    "restored": restored,
+                    "reason": "unavailable" if not line["product__is_active"] else "insufficient_stock",
+                })
+        if operations:
+            apply_cart_operations(request.user, operations)
+        cart = with_product_card(CartItem.objects.filter(user=request.user))
+        return Response(
+            {
+                "items": CartItemSerializer(cart, many=True, context={"request": request}).data,
+                "skipped": skipped,
+            },
+            status=status.HTTP_200_OK
+        )
@@ -1,3 +1,63 @@
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.orders.models import DailySalesRollup, Order, OrderStatusHistory
+from .models import Payment
+from .views import user_views
+
+
+class VerifyPaymentTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="buyer@example.com",
+            password="pass12345",
+            name="Buyer",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.order = Order.objects.create(
+            user=self.user,
+            total_amount=Decimal("250.00"),
+            full_name="Test Buyer",
+            phone="9876543210",
+            address="1 Test Street",
+            city="Kochi",
+            pincode="682001",
+        )
+        Payment.objects.create(
+            user=self.user,
+            order=self.order,
+            amount=self.order.total_amount,
+            razorpay_order_id="order_test",
+        )
+
+    def verify(self):
+        with mock.patch.object(user_views.razorpay_client.utility, "verify_payment_signature"):
+            return self.client.post(
+                "/api/payments/razorpay/verify/",
+                {
+                    "razorpay_order_id": "order_test",
+                    "razorpay_payment_id": "pay_test",
+                    "razorpay_signature": "signature",
+                },
+                format="json",
+            )
+
+    def test_verification_goes_through_the_order_lifecycle(self):
+        self.assertEqual(self.verify().status_code, 200)
+        self.assertEqual(self.verify().status_code, 200)
 
-# Create your tests here.
+        self.order.refresh_from_db()
+        self.assertTrue(self.order.is_paid)
+        self.assertEqual(self.order.status, "pending")
+        self.assertEqual(self.order.payment_id, "pay_test")
+        history = OrderStatusHistory.objects.get(order=self.order)
+        self.assertEqual((history.from_status, history.to_status), ("awaiting_payment", "pending"))
+        # a repeated verification does not count the payment twice
+        rollup = DailySalesRollup.objects.get()
+        self.assertEqual(rollup.paid_orders, 1)
+        self.assertEqual(rollup.revenue, Decimal("250.00"))
@@ -7,12 +7,15 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated,AllowAny
 from rest_framework import status
 from apps.orders.models import Order
+from apps.orders.lifecycle import TransitionError, set_paid, transition_order
+from apps.core.idempotency import idempotent
 from ..models import Payment
 razorpay_client = razorpay.Client(
     auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
 )
 class CreateRazorpayOrderView(APIView):
     permission_classes = [IsAuthenticated]
+    @idempotent("payments.razorpay_order")
     @transaction.atomic
     def post(self, request, order_id):
         order = get_object_or_404(Order, id=order_id, user=request.user)
@@ -64,11 +67,15 @@ class VerifyRazorpayPaymentView(APIView):
         payment.razorpay_signature = data["razorpay_signature"]
         payment.status = "success"
         payment.save()
-        order = payment.order
-        order.is_paid = True
-        order.status = "pending"  # ✅ UPDATED: Move from awaiting_payment to pending
-        order.payment_id = payment.razorpay_payment_id
-        order.save()
+        # locked so concurrent verifications count the payment once
+        order = Order.objects.select_for_update().get(pk=payment.order_id)
+        try:
+            set_paid(order, True, payment_id=payment.razorpay_payment_id)
+            if order.status == "awaiting_payment":
+                transition_order(order, "pending", changed_by=request.user)
+        except TransitionError as exc:
+            # the payment itself stays recorded as captured
+            return Response({"detail": exc.detail}, status=409)
         return Response({"detail": "Payment successful"})
 class RazorpayConfigView(APIView):
     permission_classes = [AllowAny]
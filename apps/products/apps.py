@@ -2,4 +2,6 @@ from django.apps import AppConfig
 
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.products'
\ No newline at end of file
+    name = 'apps.products'
+    def ready(self):
+        import apps.products.signals
@@ -0,0 +1,87 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+
+CATALOG_VERSION_KEY = "catalog:version"
+
+
+# ================= CATALOG VERSION =================
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # add() keeps a concurrent bump from being overwritten
+        cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, 1)
+    return version
+
+
+def _bump():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+
+
+def bump_catalog_version():
+    """
+    Invalidate every cached catalog response.
+
+    The bump runs after the surrounding transaction commits so a reader
+    can never cache pre-commit rows under the new version.
+    """
+    transaction.on_commit(_bump)
+
+
+# ================= RESPONSE CACHE =================
+def catalog_cache_key(prefix, request):
+    # Sorted params make ?page=2&search=x and ?search=x&page=2 share a key;
+    # host is included because serializers build absolute image URLs.
+    params = sorted(
+        (key, value)
+        for key in request.query_params
+        for value in request.query_params.getlist(key)
+    )
+    raw = "|".join([
+        request.get_host(),
+        request.path,
+        "&".join(f"{key}={value}" for key, value in params),
+    ])
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return f"catalog:{get_catalog_version()}:{prefix}:{digest}"
+
+
+class CatalogCacheMixin:
+    """
+    Serve successful list/retrieve responses from the cache.
+
+    Keys carry the catalog version, so any catalog write makes every
+    existing entry unreachable instead of having to find and delete it.
+    """
+    cache_prefix = None
+
+    def get_cached_response(self, request, build_response):
+        key = catalog_cache_key(self.cache_prefix, request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = build_response()
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            request,
+            lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            request,
+            lambda: super(CatalogCacheMixin, self).retrieve(request, *args, **kwargs),
+        )
@@ -0,0 +1,262 @@
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from .cache import bump_catalog_version
+from .models import Allergen, Category, City, Ingredient, Nutrition, Product
+from .search import update_search_vector
+from .serializers.admin_serializers import NutritionSerializer
+from .slugs import allocate_slugs
+
+
+IMPORT_FORMATS = ("csv", "jsonl")
+FORMAT_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+# multi-valued CSV cells: "Milk|Sugar|Cocoa"
+LIST_SEPARATOR = "|"
+PRODUCT_FIELDS = (
+    "name", "price", "currency", "category", "image",
+    "description", "story", "stock", "is_active",
+)
+RELATIONS = {
+    "ingredients": Ingredient,
+    "allergens": Allergen,
+    "available_cities": City,
+}
+NUTRITION_FIELDS = tuple(NutritionSerializer.Meta.fields)
+
+
+class ProductImportRowSerializer(serializers.Serializer):
+    slug = serializers.SlugField(max_length=50, required=False)
+    name = serializers.CharField(max_length=255, required=False)
+    price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False
+    )
+    currency = serializers.ChoiceField(choices=Product.CURRENCY_CHOICES, required=False)
+    category = serializers.CharField(required=False, allow_null=True)
+    image = serializers.CharField(max_length=100, required=False)
+    description = serializers.CharField(required=False, allow_blank=True)
+    story = serializers.CharField(required=False, allow_blank=True)
+    stock = serializers.IntegerField(min_value=0, required=False)
+    is_active = serializers.BooleanField(required=False)
+    ingredients = serializers.ListField(child=serializers.CharField(), required=False)
+    allergens = serializers.ListField(child=serializers.CharField(), required=False)
+    available_cities = serializers.ListField(child=serializers.CharField(), required=False)
+    nutrition = NutritionSerializer(required=False)
+
+
+# ================= READERS =================
+def detect_format(filename):
+    for extension, file_format in FORMAT_EXTENSIONS.items():
+        if filename.lower().endswith(extension):
+            return file_format
+    return None
+
+
+def _csv_row(record):
+    # empty cells mean "leave unchanged"
+    data = {
+        key.strip(): value.strip()
+        for key, value in record.items()
+        if key and isinstance(value, str) and value.strip()
+    }
+    for key in RELATIONS:
+        if key in data:
+            data[key] = [
+                value.strip() for value in data[key].split(LIST_SEPARATOR) if value.strip()
+            ]
+    nutrition = {field: data.pop(field) for field in NUTRITION_FIELDS if field in data}
+    if nutrition:
+        data["nutrition"] = nutrition
+    return data
+
+
+def read_rows(stream, file_format):
+    """Yield ``(line number, data, error)`` for every record in ``stream``."""
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, _csv_row(record), None
+        return
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield number, None, "Invalid JSON."
+            continue
+        if not isinstance(data, dict):
+            yield number, None, "Each line must be a JSON object."
+            continue
+        yield number, data, None
+
+
+# ================= IMPORTER =================
+def _name_map(model):
+    return {name.lower(): pk for pk, name in model.objects.values_list("id", "name")}
+
+
+class ProductImporter:
+    """
+    Upsert products matched by slug, ``batch_size`` rows per transaction.
+
+    Each batch costs a fixed number of queries: one to load existing rows,
+    one to allocate slugs, one INSERT ... ON CONFLICT per distinct set of
+    columns, a delete and insert per M2M relation present, one nutrition
+    upsert and one search-vector refresh. Invalid rows are reported and
+    skipped; the rest of the batch is still imported.
+    """
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.created = 0
+        self.updated = 0
+        self.errors = []
+        self.seen_slugs = set()
+        self.names = {key: _name_map(model) for key, model in RELATIONS.items()}
+        self.names["category"] = _name_map(Category)
+
+    def run(self, rows):
+        rows = iter(rows)
+        while batch := list(islice(rows, self.batch_size)):
+            self.import_batch(batch)
+        if self.created or self.updated:
+            bump_catalog_version()
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "failed": len(self.errors),
+            "errors": self.errors,
+        }
+
+    def fail(self, number, errors):
+        self.errors.append({"row": number, "errors": errors})
+
+    def resolve(self, row):
+        errors = {}
+        if row.get("category"):
+            category_id = self.names["category"].get(row["category"].lower())
+            if category_id is None:
+                errors["category"] = [f"Unknown category: {row['category']}"]
+            row["category"] = category_id
+        for key in RELATIONS:
+            if key not in row:
+                continue
+            ids, unknown = set(), []
+            for name in row[key]:
+                pk = self.names[key].get(name.lower())
+                if pk is None:
+                    unknown.append(name)
+                ids.add(pk)
+            if unknown:
+                errors[key] = [f"Unknown {key.replace('_', ' ')}: {', '.join(unknown)}"]
+            row[key] = ids
+        return errors
+
+    def import_batch(self, batch):
+        valid = []
+        for number, data, error in batch:
+            if error:
+                self.fail(number, {"non_field_errors": [error]})
+                continue
+            serializer = ProductImportRowSerializer(data=data)
+            if not serializer.is_valid():
+                self.fail(number, serializer.errors)
+                continue
+            row = dict(serializer.validated_data)
+            errors = self.resolve(row)
+            if row.get("slug") in self.seen_slugs:
+                errors["slug"] = ["Duplicate slug in this import."]
+            if errors:
+                self.fail(number, errors)
+                continue
+            if row.get("slug"):
+                self.seen_slugs.add(row["slug"])
+            valid.append((number, row))
+        if not valid:
+            return
+        try:
+            with transaction.atomic():
+                self.save(valid)
+        except IntegrityError as exc:
+            for number, _ in valid:
+                self.fail(number, {"non_field_errors": [f"Batch rolled back: {exc}"]})
+
+    def save(self, valid):
+        slugs = [row["slug"] for _, row in valid if "slug" in row]
+        existing = Product.objects.in_bulk(slugs, field_name="slug")
+
+        entries = []
+        for number, row in valid:
+            product = existing.get(row.get("slug"))
+            if product is None:
+                missing = [field for field in ("name", "price") if field not in row]
+                if missing:
+                    self.fail(number, {
+                        field: ["This field is required for new products."] for field in missing
+                    })
+                    continue
+                product = Product(slug=row.get("slug", ""))
+            for field in PRODUCT_FIELDS:
+                if field in row:
+                    setattr(product, "category_id" if field == "category" else field, row[field])
+            entries.append((row, product))
+
+        unslugged = [product for _, product in entries if not product.slug]
+        new_slugs = allocate_slugs(Product, [p.name for p in unslugged], reserved=slugs)
+        for product, slug in zip(unslugged, new_slugs):
+            product.slug = slug
+
+        # rows only overwrite the columns they carry
+        groups = defaultdict(list)
+        for row, product in entries:
+            groups[tuple(field for field in PRODUCT_FIELDS if field in row)].append(product)
+        for fields, products in groups.items():
+            Product.objects.bulk_create(
+                products,
+                update_conflicts=True,
+                unique_fields=["slug"],
+                update_fields=[*fields, "updated_at"],
+            )
+
+        unsaved = {p.slug: p for _, p in entries if p.pk is None}
+        if unsaved:
+            for slug, pk in Product.objects.filter(slug__in=unsaved).values_list("slug", "id"):
+                unsaved[slug].pk = pk
+
+        for key in RELATIONS:
+            self.replace_relation(key, [(p.pk, row[key]) for row, p in entries if key in row])
+
+        Nutrition.objects.bulk_create(
+            [Nutrition(product_id=p.pk, **row["nutrition"]) for row, p in entries if "nutrition" in row],
+            update_conflicts=True,
+            unique_fields=["product"],
+            update_fields=list(NUTRITION_FIELDS),
+        )
+
+        update_search_vector(Product.objects.filter(pk__in=[p.pk for _, p in entries]))
+        updated = sum(1 for _, p in entries if p.slug in existing)
+        self.updated += updated
+        self.created += len(entries) - updated
+
+    def replace_relation(self, key, pairs):
+        if not pairs:
+            return
+        field = Product._meta.get_field(key)
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        through.objects.filter(**{f"{source}_id__in": [pk for pk, _ in pairs]}).delete()
+        through.objects.bulk_create([
+            through(**{f"{source}_id": pk, f"{target}_id": related_id})
+            for pk, related_ids in pairs
+            for related_id in related_ids
+        ])
+
+
+def import_products(stream, file_format, batch_size=1000):
+    return ProductImporter(batch_size).run(read_rows(stream, file_format))
@@ -0,0 +1,89 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.products.models import Product
+from apps.products.search import (
+    ProductSearchFilter,
+    search_backend_available,
+    update_search_vector,
+)
+from apps.products.views.user_views import ProductListView
+
+
+WORDS = [
+    "chocolate", "vanilla", "mango", "pistachio", "caramel", "strawberry",
+    "almond", "coffee", "coconut", "hazelnut", "fudge", "mint", "honey",
+    "cookie", "butterscotch", "berry", "saffron", "cardamom", "jaggery",
+]
+SEARCHES = ["chocolate", "mango pistachio", "salted caramel", "saffron", "zzz"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the icontains SearchFilter with the full-text search backend "
+        "on a synthetic catalog. All generated rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        if not search_backend_available():
+            raise CommandError("Full-text search requires PostgreSQL.")
+
+        with transaction.atomic():
+            self.seed(options["products"])
+            for term in SEARCHES:
+                legacy = self.measure(SearchFilter(), term, options["repeat"])
+                fulltext = self.measure(ProductSearchFilter(), term, options["repeat"])
+                self.stdout.write(
+                    f"{term!r:>20}  icontains {legacy:8.2f} ms   "
+                    f"full-text {fulltext:8.2f} ms"
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        self.stdout.write(f"Creating {count} products...")
+        rng = random.Random(42)
+        products = [
+            Product(
+                name=" ".join(rng.sample(WORDS, 3)).title(),
+                slug=f"benchmark-{i}",
+                price=Decimal(rng.randint(50, 500)),
+                image="products/benchmark.jpg",
+                description=" ".join(rng.choices(WORDS, k=30)),
+                story=" ".join(rng.choices(WORDS, k=60)),
+                stock=rng.randint(0, 100),
+            )
+            for i in range(count)
+        ]
+        Product.objects.bulk_create(products, batch_size=5000)
+        update_search_vector(Product.objects.filter(slug__startswith="benchmark-"))
+        # fresh statistics so the planner considers the GIN index
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Product._meta.db_table}")
+
+    def measure(self, backend, term, repeat):
+        factory = APIRequestFactory()
+        view = ProductListView()
+        view.request = Request(factory.get("/api/products/", {"search": term}))
+        view.format_kwarg = None
+
+        timings = []
+        for _ in range(repeat):
+            queryset = view.get_queryset()
+            start = time.perf_counter()
+            queryset = backend.filter_queryset(view.request, queryset, view)
+            # first page plus count, as ProductListView's pagination does
+            queryset.count()
+            list(queryset[:10])
+            timings.append((time.perf_counter() - start) * 1000)
+        return sorted(timings)[len(timings) // 2]
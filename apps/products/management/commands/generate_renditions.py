@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.core.images import RENDITIONS_FIELD, process_renditions, renditions_outdated
+from apps.products.cache import bump_catalog_version
+from apps.products.models import Category, Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Build thumb/card/detail renditions for product, category and profile "
+        "images that have none yet (or whose image changed)."
+    )
+
+    def handle(self, *args, **options):
+        catalog_updated = False
+        for model in (Product, Category, get_user_model()):
+            built = failed = 0
+            rows = model.objects.only("id", "image", RENDITIONS_FIELD).iterator(chunk_size=500)
+            for instance in rows:
+                if not renditions_outdated(instance):
+                    continue
+                if process_renditions(
+                    model, instance.pk, instance.image.name, getattr(instance, RENDITIONS_FIELD)
+                ):
+                    built += 1
+                else:
+                    failed += 1
+            if built and model is not get_user_model():
+                catalog_updated = True
+            self.stdout.write(f"{model._meta.verbose_name_plural}: built {built}, failed {failed}")
+        if catalog_updated:
+            bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS("Done."))
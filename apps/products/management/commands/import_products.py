@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.products.importers import IMPORT_FORMATS, detect_format, import_products
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or update products from a CSV or JSON Lines file. Rows are "
+        "matched by slug; category, ingredient, allergen and city are given by name."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=IMPORT_FORMATS)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or detect_format(options["path"])
+        if file_format is None:
+            raise CommandError("Cannot tell the file format; pass --format csv or --format jsonl.")
+
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                report = import_products(stream, file_format, options["batch_size"])
+        except OSError as exc:
+            raise CommandError(exc)
+
+        for error in report["errors"]:
+            self.stderr.write(f"row {error['row']}: {dict(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report['created']}, updated {report['updated']}, "
+            f"failed {report['failed']}."
+        ))
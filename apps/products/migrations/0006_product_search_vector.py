@@ -0,0 +1,46 @@
+# Generated by Django 6.0.1 on 2026-10-17 10:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class AddIndexOnPostgres(migrations.AddIndex):
+    # GIN indexes do not exist on SQLite, which the test suite may use
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def populate_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    from apps.products.search import product_search_vector
+
+    Product = apps.get_model("products", "Product")
+    Category = apps.get_model("products", "Category")
+    Product.objects.update(search_vector=product_search_vector(Category))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_average_rating_product_review_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        AddIndexOnPostgres(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='products_search_vector_gin'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:00
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def populate_rating_sum(apps, schema_editor):
+    Product = apps.get_model("products", "Product")
+    Review = apps.get_model("reviews", "Review")
+    totals = (
+        Review.objects
+        .filter(is_active=True)
+        .values("product_id")
+        .annotate(total=Sum("rating"))
+        .order_by()
+    )
+    products = []
+    for row in totals:
+        products.append(Product(pk=row["product_id"], rating_sum=row["total"]))
+    Product.objects.bulk_update(products, ["rating_sum"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_product_keyset_indexes'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_rating_sum, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:30
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_rating_histogram(apps, schema_editor):
+    Product = apps.get_model("products", "Product")
+    Review = apps.get_model("reviews", "Review")
+    products = {}
+    rows = (
+        Review.objects
+        .filter(is_active=True)
+        .values("product_id", "rating")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        product = products.setdefault(row["product_id"], Product(pk=row["product_id"]))
+        setattr(product, f"rating_{row['rating']}_count", row["count"])
+    Product.objects.bulk_update(
+        products.values(),
+        [f"rating_{star}_count" for star in range(1, 6)],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_product_rating_sum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_rating_histogram, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
-from django.utils.text import slugify
 from django.core.validators import MinValueValidator
-class Category(models.Model):
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from .slugs import UniqueSlugMixin
+class Category(UniqueSlugMixin, models.Model):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(unique=True, blank=True)
     image = models.ImageField(
@@ -9,18 +11,10 @@ class Category(models.Model):
         blank=True,
         null=True
     )
+    # resized copies of image, filled in by core.images after upload
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     class Meta:
         ordering = ["name"]
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-            while Category.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
     def __str__(self):
         return self.name
 class Ingredient(models.Model):
@@ -38,7 +32,15 @@ class City(models.Model):
         ordering = ["name"]
     def __str__(self):
         return f"{self.name} ({self.pincode})"
-class Product(models.Model):
+class Product(UniqueSlugMixin, models.Model):
+    # star -> histogram column, maintained by the review signals
+    RATING_COUNT_FIELDS = {
+        1: "rating_1_count",
+        2: "rating_2_count",
+        3: "rating_3_count",
+        4: "rating_4_count",
+        5: "rating_5_count",
+    }
     CURRENCY_CHOICES = [
         ("INR", "Indian Rupee"),
         ("USD", "US Dollar"),
@@ -63,6 +65,7 @@ class Product(models.Model):
         related_name="products"
     )
     image = models.ImageField(upload_to="products/")
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     ingredients = models.ManyToManyField(
         Ingredient,
         related_name="products"
@@ -76,6 +79,13 @@ class Product(models.Model):
     story = models.TextField(blank=True)
     average_rating = models.FloatField(default=0)
     review_count = models.PositiveIntegerField(default=0)
+    # running total of active review ratings; average = rating_sum / review_count
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
     stock = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
     available_cities = models.ManyToManyField(
@@ -84,24 +94,27 @@ class Product(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # weighted name/category/description/story, kept by products.search
+    search_vector = SearchVectorField(null=True, editable=False)
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["slug"]),
             models.Index(fields=["is_active"]),
+            # keyset pagination positions
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["price"]),
+            models.Index(fields=["average_rating"]),
+            GinIndex(fields=["search_vector"], name="products_search_vector_gin"),
         ]
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-            while Product.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
     def __str__(self):
         return f"{self.name} ({self.price} {self.currency})"
+    @property
+    def rating_distribution(self):
+        return {
+            str(star): getattr(self, field)
+            for star, field in self.RATING_COUNT_FIELDS.items()
+        }
 class Nutrition(models.Model):
     product = models.OneToOneField(
         Product,
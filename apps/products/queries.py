@@ -0,0 +1,67 @@
+from django.db.models import Prefetch
+
+from apps.core.sparse import wants
+from .models import Product
+
+
+# ProductSerializer field -> columns only that field reads
+DEFERRABLE_COLUMNS = {
+    "description": ["description"],
+    "story": ["story"],
+    "images": ["image_renditions"],
+    "rating_distribution": list(Product.RATING_COUNT_FIELDS.values()),
+}
+
+
+def product_queryset_for(queryset, tree, prefix=""):
+    """
+    Load what ``ProductSerializer`` renders for the sparse field ``tree``
+    (None = everything): join or prefetch only requested relations and
+    defer unrequested text columns. ``prefix`` is the lookup path when the
+    product is nested, e.g. ``"product__"`` for cart rows.
+    """
+    queryset = queryset.defer(f"{prefix}search_vector")
+    related = [f"{prefix}{name}" for name in ("category", "nutrition") if wants(tree, name)]
+    if related:
+        queryset = queryset.select_related(*related)
+    prefetch = [f"{prefix}{name}" for name in ("ingredients", "allergens") if wants(tree, name)]
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    deferred = [
+        f"{prefix}{column}"
+        for name, columns in DEFERRABLE_COLUMNS.items()
+        if not wants(tree, name)
+        for column in columns
+    ]
+    if deferred:
+        queryset = queryset.defer(*deferred)
+    return queryset
+
+
+# columns ProductCardSerializer reads
+PRODUCT_CARD_COLUMNS = [
+    "id", "name", "slug", "price", "currency", "image", "image_renditions",
+    "stock", "is_active", "average_rating", "review_count",
+]
+
+
+def with_product_card(queryset, name="product"):
+    """
+    Join the ``name`` product of each row, loading only the card columns,
+    so embedding ``ProductCardSerializer`` costs no query per row.
+    """
+    model = queryset.model
+    own = [field.name for field in model._meta.concrete_fields]
+    return (
+        queryset
+        .select_related(name)
+        .only(*own, *(f"{name}__{column}" for column in PRODUCT_CARD_COLUMNS))
+    )
+
+
+def order_item_products():
+    """Products as order item rows show them: name, slug, image, rating."""
+    return Prefetch(
+        "items__product",
+        queryset=Product.objects.defer("description", "story", "search_vector"),
+    )
@@ -0,0 +1,80 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from rest_framework.filters import SearchFilter, OrderingFilter
+
+
+SEARCH_CONFIG = "english"
+
+
+def search_backend_available():
+    return connection.vendor == "postgresql"
+
+
+# ================= SEARCH VECTOR =================
+def product_search_vector(category_model=None):
+    if category_model is None:
+        from .models import Category as category_model
+
+    category_name = Subquery(
+        category_model.objects
+        .filter(pk=OuterRef("category_id"))
+        .values("name")[:1]
+    )
+    return (
+        SearchVector("name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(Coalesce(category_name, Value("")), weight="B", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+        + SearchVector("story", weight="D", config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vector(queryset):
+    """
+    Rebuild ``search_vector`` for every product in ``queryset`` with one
+    UPDATE. No-op outside Postgres, where search falls back to ``icontains``.
+    """
+    if not search_backend_available():
+        return 0
+    return queryset.update(search_vector=product_search_vector())
+
+
+# ================= FILTER BACKENDS =================
+class ProductSearchFilter(SearchFilter):
+    """
+    Full-text search over the GIN-indexed ``search_vector``, annotated with
+    ``search_rank``. Non-Postgres databases use DRF's ``icontains`` search.
+    """
+    rank_annotation = "search_rank"
+
+    def filter_queryset(self, request, queryset, view):
+        if not search_backend_available():
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        query = SearchQuery(
+            " ".join(terms),
+            search_type="websearch",
+            config=SEARCH_CONFIG,
+        )
+        return (
+            queryset
+            .filter(search_vector=query)
+            .annotate(**{self.rank_annotation: SearchRank(F("search_vector"), query)})
+        )
+
+
+class ProductOrderingFilter(OrderingFilter):
+    """
+    Order by relevance when searching without an explicit ``?ordering=``.
+    """
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        rank = ProductSearchFilter.rank_annotation
+        if not params and rank in queryset.query.annotations:
+            return [f"-{rank}", *(self.get_default_ordering(view) or [])]
+        return super().get_ordering(request, queryset, view)
@@ -1,5 +1,6 @@
 import json
 from rest_framework import serializers
+from apps.core.images import rendition_urls
 from apps.products.models import Product, Category, Ingredient, Allergen, City, Nutrition
 
 
@@ -32,6 +33,10 @@ class NutritionSerializer(serializers.ModelSerializer):
 class AdminProductSerializer(serializers.ModelSerializer):
     nutrition = NutritionSerializer(required=False)
     category_details = AdminCategorySerializer(source="category", read_only=True)
+    rating_distribution = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True
+    )
+    images = serializers.SerializerMethodField()
     
     # For writing (lists of IDs)
     category = serializers.PrimaryKeyRelatedField(
@@ -51,8 +56,8 @@ class AdminProductSerializer(serializers.ModelSerializer):
         model = Product
         fields = [
             "id", "name", "slug", "price", "currency", "category", "category_details",
-            "image", "ingredients", "allergens", "available_cities", "description",
-            "story", "average_rating", "review_count", "stock", "is_active",
+            "image", "images", "ingredients", "allergens", "available_cities", "description",
+            "story", "average_rating", "review_count", "rating_distribution", "stock", "is_active",
             "nutrition", "created_at", "updated_at"
         ]
         read_only_fields = (
@@ -63,6 +68,9 @@ class AdminProductSerializer(serializers.ModelSerializer):
             "updated_at",
         )
 
+    def get_images(self, obj):
+        return rendition_urls(obj, self.context.get("request"))
+
     def to_internal_value(self, data):
         # Multipart data (QueryDict) + Windows + Files = Pickle Error on .copy()
         mutable_data = {}
@@ -141,3 +149,24 @@ class AdminProductSerializer(serializers.ModelSerializer):
             )
 
         return instance
+
+
+class ProductBulkUpdateItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False)
+    slug = serializers.SlugField(required=False)
+    stock = serializers.IntegerField(min_value=0, required=False)
+    price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False
+    )
+    is_active = serializers.BooleanField(required=False)
+
+    UPDATE_FIELDS = ("stock", "price", "is_active")
+
+    def validate(self, attrs):
+        if ("id" in attrs) == ("slug" in attrs):
+            raise serializers.ValidationError("Give exactly one of id or slug.")
+        if not any(field in attrs for field in self.UPDATE_FIELDS):
+            raise serializers.ValidationError(
+                "Give at least one of: " + ", ".join(self.UPDATE_FIELDS)
+            )
+        return attrs
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.db import transaction
+from apps.core.images import rendition_urls
+from apps.core.janitor import queue_deletion
+from apps.core.sparse import SparseFieldsetMixin
 from ..models import (
     Product,
     Ingredient,
@@ -9,6 +12,7 @@ from ..models import (
 )
 class CategorySerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    images = serializers.SerializerMethodField()
     image_upload = serializers.ImageField(
         write_only=True,
         required=False
@@ -21,6 +25,7 @@ class CategorySerializer(serializers.ModelSerializer):
             "name",
             "slug",
             "image",   
+            "images",
             "image_upload",  
         ]
     def get_image(self, obj):
@@ -28,6 +33,8 @@ class CategorySerializer(serializers.ModelSerializer):
         if obj.image and request:
             return request.build_absolute_uri(obj.image.url)
         return None
+    def get_images(self, obj):
+        return rendition_urls(obj, self.context.get("request"))
     def create(self, validated_data):
         image = validated_data.pop("image_upload", None)
         category = Category.objects.create(**validated_data)
@@ -37,13 +44,14 @@ class CategorySerializer(serializers.ModelSerializer):
         return category
     def update(self, instance, validated_data):
         image = validated_data.pop("image_upload", None)
+        old_image = instance.image.name if image and instance.image else None
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         if image:
-            if instance.image:
-                instance.image.delete(save=False)
             instance.image = image
         instance.save()
+        if old_image and old_image != instance.image.name:
+            queue_deletion(instance.image.storage, old_image)
         return instance
 class IngredientSerializer(serializers.ModelSerializer):
     class Meta:
@@ -57,13 +65,38 @@ class AllergenSerializer(serializers.ModelSerializer):
     class Meta:
         model = Allergen
         fields = ["id", "name"]
-class ProductSerializer(serializers.ModelSerializer):
+class ProductCardSerializer(serializers.ModelSerializer):
+    """Compact read-only product for cart, wishlist and other embeds."""
+    images = serializers.SerializerMethodField()
+    class Meta:
+        model = Product
+        fields = [
+            "id",
+            "name",
+            "slug",
+            "price",
+            "currency",
+            "image",
+            "images",
+            "stock",
+            "is_active",
+            "average_rating",
+            "review_count",
+        ]
+        read_only_fields = fields
+    def get_images(self, obj):
+        return rendition_urls(obj, self.context.get("request"))
+class ProductSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     ingredients = IngredientSerializer(many=True, read_only=True)
     nutrition = NutritionSerializer(read_only=True)
     allergens = AllergenSerializer(many=True, read_only=True)
     average_rating = serializers.FloatField(read_only=True)
     review_count = serializers.IntegerField(read_only=True)
+    rating_distribution = serializers.DictField(
+        child=serializers.IntegerField(),
+        read_only=True
+    )
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=Category.objects.all(),
         write_only=True,
@@ -82,6 +115,7 @@ class ProductSerializer(serializers.ModelSerializer):
         required=False
     )
     slug = serializers.ReadOnlyField()
+    images = serializers.SerializerMethodField()
     class Meta:
         model = Product
         fields = [
@@ -93,6 +127,7 @@ class ProductSerializer(serializers.ModelSerializer):
             "price",
             "currency",
             "image",
+            "images",
             "ingredients",
             "ingredient_ids",
             "nutrition",
@@ -107,7 +142,10 @@ class ProductSerializer(serializers.ModelSerializer):
             "updated_at",
             "average_rating", 
             "review_count",
+            "rating_distribution",
         ]
+    def get_images(self, obj):
+        return rendition_urls(obj, self.context.get("request"))
     def validate_stock(self, value):
         if value < 0:
             raise serializers.ValidationError("Stock cannot be negative")
@@ -135,8 +173,7 @@ class ProductSerializer(serializers.ModelSerializer):
         ingredient_ids = validated_data.pop("ingredient_ids", None)
         nutrition_data = validated_data.pop("nutrition_data", None)
         allergen_ids = validated_data.pop("allergen_ids", None)
-        if "image" in validated_data and instance.image:
-            instance.image.delete(save=False)
+        old_image = instance.image.name if "image" in validated_data and instance.image else None
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         if nutrition_data:
@@ -148,4 +185,6 @@ class ProductSerializer(serializers.ModelSerializer):
         if allergen_ids is not None:
             instance.allergens.set(allergen_ids)
         instance.save()
+        if old_image and old_image != instance.image.name:
+            queue_deletion(instance._meta.get_field("image").storage, old_image)
         return instance
@@ -0,0 +1,47 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from apps.core.images import schedule_renditions
+from .models import Product, Category, Nutrition
+from .cache import bump_catalog_version
+from .search import update_search_vector
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Nutrition)
+def catalog_saved(sender, instance, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Nutrition)
+def catalog_deleted(sender, instance, **kwargs):
+    bump_catalog_version()
+
+
+# M2M .set() runs after Product.save(), so it needs its own bump
+@receiver(m2m_changed, sender=Product.ingredients.through)
+@receiver(m2m_changed, sender=Product.allergens.through)
+@receiver(m2m_changed, sender=Product.available_cities.through)
+def catalog_relations_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_catalog_version()
+
+
+@receiver(post_save, sender=Product)
+def product_search_vector_refresh(sender, instance, **kwargs):
+    update_search_vector(Product.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Category)
+def category_search_vector_refresh(sender, instance, created, **kwargs):
+    if not created:
+        update_search_vector(Product.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Category)
+def catalog_image_renditions(sender, instance, **kwargs):
+    # cached catalog pages pick up the new "images" map once it is ready
+    schedule_renditions(instance, after=bump_catalog_version)
@@ -0,0 +1,90 @@
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+
+# room kept for "-<n>" so suffixed slugs still fit the column
+SUFFIX_RESERVE = 7
+SLUG_RETRIES = 3
+
+
+def base_slug(model, value, field="slug"):
+    max_length = model._meta.get_field(field).max_length
+    base = slugify(value)[:max_length - SUFFIX_RESERVE].strip("-")
+    return base or model._meta.model_name
+
+
+def _mark_taken(taken, slug):
+    if slug in taken:
+        taken[slug].add(0)
+    head, _, tail = slug.rpartition("-")
+    if head in taken and tail.isdigit():
+        taken[head].add(int(tail))
+
+
+def _taken(model, bases, field):
+    """``{base: set of used suffixes}``, 0 meaning the bare base, in one query."""
+    taken = {base: set() for base in bases}
+    if not bases:
+        return taken
+    lookup = reduce(or_, (
+        Q(**{f"{field}__startswith": f"{base}-"}) for base in bases
+    ), Q(**{f"{field}__in": bases}))
+    for slug in model._default_manager.filter(lookup).values_list(field, flat=True).iterator():
+        _mark_taken(taken, slug)
+    return taken
+
+
+def allocate_slugs(model, values, field="slug", reserved=()):
+    """
+    Unique slugs for ``values`` (in order), e.g. names of rows about to be
+    bulk-created. Existing slugs are read with one prefix query and the
+    lowest free suffix is picked in memory, so 500 rows sharing a name cost
+    the same as one. ``reserved`` slugs are treated as taken, for rows of
+    the same batch that bring their own. Callers still rely on the unique
+    index for races.
+    """
+    bases = [base_slug(model, value, field) for value in values]
+    taken = _taken(model, sorted(set(bases)), field)
+    for slug in reserved:
+        _mark_taken(taken, slug)
+    slugs = []
+    for base in bases:
+        used = taken[base]
+        suffix = 0
+        while suffix in used:
+            suffix += 1
+        used.add(suffix)
+        slugs.append(f"{base}-{suffix}" if suffix else base)
+    return slugs
+
+
+def allocate_slug(model, value, field="slug"):
+    return allocate_slugs(model, [value], field)[0]
+
+
+class UniqueSlugMixin:
+    """
+    Fill ``slug`` from ``slug_source`` on save. A concurrent writer taking
+    the same slug makes the insert fail on the unique index; the save is
+    then retried with a freshly allocated slug.
+    """
+    slug_source = "name"
+
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+        model = type(self)
+        for attempt in range(SLUG_RETRIES):
+            self.slug = allocate_slug(model, getattr(self, self.slug_source))
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                slug_taken = model._default_manager.filter(slug=self.slug).exists()
+                self.slug = ""
+                if attempt == SLUG_RETRIES - 1 or not slug_taken:
+                    raise
@@ -1,3 +1,452 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.core import janitor
+from apps.core.images import process_renditions, rendition_paths
+from apps.orders.services import reserve_stock
+from . import slugs
+from .cache import get_catalog_version
+from .importers import import_products
+from .models import Category, Ingredient, Product
+from .serializers.user_serializers import ProductSerializer
+from .slugs import allocate_slugs
+
+
+def make_image(color, name="photo.png", size=(40, 30)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class MediaTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def make_product(self, name, image):
+        return Product.objects.create(name=name, price=Decimal("100.00"), image=image, stock=5)
+
+    def build(self, product, stale=None):
+        deleted = []
+        with mock.patch.object(janitor, "_enqueue", lambda storage, name: deleted.append((storage, name))):
+            with self.captureOnCommitCallbacks(execute=True):
+                process_renditions(Product, product.pk, product.image.name, stale)
+        # run the janitor inline instead of on its thread
+        janitor.delete_batch(deleted)
+        product.refresh_from_db()
+
+
+class ImageRenditionTests(MediaTestCase):
+    def test_renditions_are_built_and_served(self):
+        product = self.make_product("Mango", make_image("orange", size=(1600, 800)))
+        self.assertEqual(ProductSerializer(product).data["images"], {})
+
+        self.build(product)
+
+        storage = product.image.storage
+        thumb = product.image_renditions["thumb"]
+        with storage.open(thumb["webp"]) as thumb_file:
+            self.assertEqual(Image.open(thumb_file).size, (160, 80))
+        with storage.open(product.image_renditions["detail"]["jpeg"]) as detail_file:
+            self.assertEqual(Image.open(detail_file).size, (1200, 600))
+        images = ProductSerializer(product).data["images"]
+        self.assertEqual(set(images), {"thumb", "card", "detail"})
+        self.assertEqual(set(images["card"]), {"webp", "jpeg"})
+
+    def test_build_for_a_replaced_image_is_discarded(self):
+        product = self.make_product("Mango", make_image("orange"))
+        old_name = product.image.name
+        product.image = make_image("yellow")
+        product.save()
+
+        self.assertFalse(process_renditions(Product, product.pk, old_name))
+        product.refresh_from_db()
+        self.assertEqual(product.image_renditions, {})
+
+    def test_upload_is_processed_after_commit(self):
+        with mock.patch("apps.core.images.get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                product = self.make_product("Mango", make_image("orange"))
+
+        get_executor.return_value.submit.assert_called_once()
+        args = get_executor.return_value.submit.call_args.args
+        self.assertEqual(args[1:4], (Product, product.pk, product.image.name))
+
+
+class SharedMediaTests(MediaTestCase):
+    def test_replacing_one_products_image_keeps_the_shared_files(self):
+        first = self.make_product("Vanilla", make_image("white"))
+        second = self.make_product("Vanilla Bean", make_image("white"))
+        self.assertEqual(first.image.name, second.image.name)
+        self.build(first)
+        self.build(second)
+        shared = rendition_paths(second.image_renditions)
+        self.assertEqual(rendition_paths(first.image_renditions), shared)
+
+        stale = first.image_renditions
+        first.image = make_image("brown")
+        first.save()
+        self.build(first, stale=stale)
+
+        storage = second.image.storage
+        self.assertNotEqual(first.image.name, second.image.name)
+        self.assertTrue(storage.exists(second.image.name))
+        for path in shared:
+            self.assertTrue(storage.exists(path), path)
+        for path in rendition_paths(first.image_renditions):
+            self.assertTrue(storage.exists(path), path)
+
+    def test_replaced_renditions_nobody_shares_are_deleted(self):
+        product = self.make_product("Mango", make_image("orange"))
+        self.build(product)
+        stale = product.image_renditions
+
+        product.image = make_image("yellow")
+        product.save()
+        self.build(product, stale=stale)
+
+        storage = product.image.storage
+        for path in rendition_paths(stale):
+            self.assertFalse(storage.exists(path), path)
+
+
+class MediaJanitorTests(MediaTestCase):
+    def collect(self):
+        deleted = []
+        patcher = mock.patch.object(janitor, "_enqueue", lambda storage, name: deleted.append((storage, name)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return deleted
+
+    def test_deletion_waits_for_commit_and_skips_shared_files(self):
+        first = self.make_product("Vanilla", make_image("white"))
+        self.make_product("Vanilla Bean", make_image("white"))
+        dropped = self.make_product("Licorice", make_image("black"))
+        storage = first.image.storage
+        deleted = self.collect()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            janitor.queue_deletion(storage, first.image.name)
+            janitor.queue_deletion(storage, dropped.image.name)
+            Product.objects.filter(pk=dropped.pk).delete()
+        self.assertEqual(deleted, [])
+        for callback in callbacks:
+            callback()
+        janitor.delete_batch(deleted)
+
+        self.assertTrue(storage.exists(first.image.name))
+        self.assertFalse(storage.exists(dropped.image.name))
+
+    def test_replaced_profile_image_is_queued_after_save(self):
+        user = User.objects.create_user(email="buyer@example.com", password="pass12345", name="Buyer")
+        user.image = make_image("green")
+        user.save()
+        user = User.objects.get(pk=user.pk)
+        old_name = user.image.name
+        deleted = self.collect()
+
+        user.image = make_image("blue")
+        # keep the rendition build off the worker thread, which would outlive MEDIA_ROOT
+        with mock.patch("apps.core.images.get_executor"):
+            with self.captureOnCommitCallbacks(execute=True):
+                user.save()
+
+        self.assertEqual([name for _, name in deleted], [old_name])
+
+    def test_sweep_deletes_only_unreferenced_files(self):
+        product = self.make_product("Mango", make_image("orange"))
+        storage = product.image.storage
+        orphan = storage.save("products/orphan.png", make_image("purple"))
+        out = StringIO()
+
+        call_command("sweep_media", "--min-age-hours=0", "--dry-run", stdout=out)
+        self.assertIn(orphan, out.getvalue())
+        self.assertTrue(storage.exists(orphan))
+
+        call_command("sweep_media", "--min-age-hours=0", stdout=StringIO())
+        self.assertFalse(storage.exists(orphan))
+        self.assertTrue(storage.exists(product.image.name))
+
+
+class CatalogCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.product = Product.objects.create(
+            name="Mango",
+            price=Decimal("100.00"),
+            image="products/test.jpg",
+            stock=5,
+        )
+
+    def names(self):
+        response = self.client.get("/api/products/")
+        self.assertEqual(response.status_code, 200)
+        return [row["name"] for row in response.data["results"]]
+
+    def test_repeated_page_is_served_without_queries(self):
+        self.names()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names(), ["Mango"])
+
+    def test_product_save_invalidates_cached_pages(self):
+        self.names()
+
+        with mock.patch("apps.core.images.get_executor"):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.product.name = "Mango Sorbet"
+                self.product.save()
+
+        self.assertEqual(self.names(), ["Mango Sorbet"])
+
+    def test_checkout_invalidates_only_when_a_product_sells_out(self):
+        version = get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve_stock({self.product.id: 2})
+        self.assertEqual(get_catalog_version(), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve_stock({self.product.id: 3})
+        self.assertGreater(get_catalog_version(), version)
+
+
+class KeysetPaginationTests(TestCase):
+    def test_tied_prices_page_without_gaps_or_repeats(self):
+        for index in range(15):
+            Product.objects.create(
+                name=f"Scoop {index}",
+                price=Decimal("100.00") if index % 3 else Decimal("80.00"),
+                image="products/test.jpg",
+                stock=5,
+            )
+
+        first = self.client.get("/api/products/", {"pagination": "keyset", "ordering": "price"})
+        second = self.client.get(first.data["next"])
+
+        ids = [row["id"] for row in first.data["results"] + second.data["results"]]
+        self.assertEqual(len(first.data["results"]), 10)
+        self.assertIsNone(second.data["next"])
+        self.assertEqual(sorted(ids), sorted(Product.objects.values_list("id", flat=True)))
+        prices = [Decimal(row["price"]) for row in first.data["results"] + second.data["results"]]
+        self.assertEqual(prices, sorted(prices))
+
+
+class SlugAllocationTests(TestCase):
+    def make_product(self, name):
+        return Product.objects.create(name=name, price=Decimal("100.00"), image="products/test.jpg", stock=5)
+
+    def test_colliding_names_get_the_lowest_free_suffix(self):
+        slugs_made = [self.make_product("Vanilla Bean").slug for _ in range(3)]
+        self.assertEqual(slugs_made, ["vanilla-bean", "vanilla-bean-1", "vanilla-bean-2"])
+
+        Product.objects.filter(slug="vanilla-bean-1").delete()
+        self.assertEqual(self.make_product("Vanilla Bean").slug, "vanilla-bean-1")
+        # other bases sharing the prefix do not count as suffixes
+        self.assertEqual(self.make_product("Vanilla Bean Twist").slug, "vanilla-bean-twist")
+
+    def test_batch_allocation_uses_one_query(self):
+        self.make_product("Mango")
+        with self.assertNumQueries(1):
+            allocated = allocate_slugs(Product, ["Mango", "Mango", "Kulfi"], reserved=["kulfi"])
+        self.assertEqual(allocated, ["mango-1", "mango-2", "kulfi-1"])
+
+    def test_slug_taken_by_a_concurrent_writer_is_retried(self):
+        Category.objects.create(name="Sorbet")
+        real = slugs.allocate_slug
+        stale = iter(["sorbet"])
+
+        def allocate(model, value, field="slug"):
+            # first answer predates the other writer's commit
+            return next(stale, None) or real(model, value, field)
+
+        with mock.patch.object(slugs, "allocate_slug", allocate):
+            category = Category(name="Sorbét")
+            category.save()
+
+        self.assertEqual(category.slug, "sorbet-1")
+
+
+IMPORT_CSV = """slug,name,price,category,stock,ingredients
+,Mango Kulfi,120.00,Kulfi,10,Milk|Mango
+,Pista Kulfi,-5,Kulfi,10,Milk
+,Rose Kulfi,110.00,Kulfi,4,Milk|Rose
+"""
+
+
+class ProductImportTests(TestCase):
+    def setUp(self):
+        Category.objects.create(name="Kulfi")
+        Ingredient.objects.bulk_create(Ingredient(name=name) for name in ("Milk", "Mango"))
+
+    def test_bad_rows_are_reported_and_the_rest_imported(self):
+        report = import_products(StringIO(IMPORT_CSV), "csv")
+
+        self.assertEqual((report["created"], report["updated"], report["failed"]), (1, 0, 2))
+        errors = {line["row"]: line["errors"] for line in report["errors"]}
+        self.assertIn("price", errors[3])
+        self.assertIn("ingredients", errors[4])
+        product = Product.objects.get()
+        self.assertEqual((product.slug, product.stock), ("mango-kulfi", 10))
+        self.assertEqual(product.category.name, "Kulfi")
+        self.assertEqual(sorted(product.ingredients.values_list("name", flat=True)), ["Mango", "Milk"])
+
+    def test_rows_with_a_known_slug_update_only_their_columns(self):
+        import_products(StringIO(IMPORT_CSV), "csv")
+        rows = '{"slug": "mango-kulfi", "stock": 3}\n{"slug": "new-kulfi"}\n'
+
+        report = import_products(StringIO(rows), "jsonl")
+
+        self.assertEqual((report["created"], report["updated"], report["failed"]), (0, 1, 1))
+        product = Product.objects.get(slug="mango-kulfi")
+        self.assertEqual((product.stock, product.price), (3, Decimal("120.00")))
+
+    def test_upload_endpoint(self):
+        admin = User.objects.create_superuser(email="admin@example.com", password="pass12345", name="Admin")
+        client = APIClient()
+        client.force_authenticate(admin)
+        upload = SimpleUploadedFile("products.csv", IMPORT_CSV.encode(), content_type="text/csv")
+
+        response = client.post("/api/admin/products/import/", {"file": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["failed"], 2)
+
+
+class ProductBulkUpdateTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser(email="admin@example.com", password="pass12345", name="Admin")
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.cone = Product.objects.create(name="Cone", price=Decimal("50.00"), image="products/test.jpg", stock=5)
+        self.tub = Product.objects.create(name="Tub", price=Decimal("200.00"), image="products/test.jpg", stock=5)
+
+    def post(self, items):
+        return self.client.post("/api/admin/products/bulk-update/", items, format="json")
+
+    def test_applies_changes_and_reports_only_what_changed(self):
+        response = self.post([
+            {"id": self.cone.id, "stock": 12, "price": "50.00"},
+            {"slug": self.tub.slug, "is_active": False},
+            {"slug": "missing", "stock": 1},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(response.data["not_found"], ["missing"])
+        changes = {change["id"]: change for change in response.data["changes"]}
+        self.assertEqual(changes[self.cone.id]["stock"], [5, 12])
+        self.assertNotIn("price", changes[self.cone.id])
+        self.cone.refresh_from_db()
+        self.tub.refresh_from_db()
+        self.assertEqual(self.cone.stock, 12)
+        self.assertFalse(self.tub.is_active)
+
+    def test_invalid_item_rejects_the_whole_request(self):
+        response = self.post([
+            {"id": self.cone.id, "stock": 12},
+            {"id": self.tub.id, "stock": -1},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.cone.refresh_from_db()
+        self.assertEqual(self.cone.stock, 5)
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="Kulfi")
+        self.product = Product.objects.create(
+            name="Mango Kulfi",
+            price=Decimal("120.00"),
+            image="products/test.jpg",
+            category=category,
+            stock=5,
+        )
+        self.product.ingredients.add(Ingredient.objects.create(name="Milk"))
+
+    def test_fields_prune_nested_serializers(self):
+        response = self.client.get("/api/products/", {"fields": "id,name,category.name"})
+
+        row = response.data["results"][0]
+        self.assertEqual(set(row), {"id", "name", "category"})
+        self.assertEqual(row["category"], {"name": "Kulfi"})
+
+    def test_expand_adds_whole_nested_objects(self):
+        response = self.client.get(
+            f"/api/products/{self.product.slug}/", {"fields": "id", "expand": "category"}
+        )
+
+        self.assertEqual(set(response.data), {"id", "category"})
+        self.assertIn("slug", response.data["category"])
+
+    def test_unrequested_relations_are_not_loaded(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/products/", {"fields": "id,name"})
+
+        self.assertEqual(set(response.data["results"][0]), {"id", "name"})
+        sql = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn("products_product_ingredients", sql)
+        self.assertNotIn('"products_product"."description"', sql)
+
+        full = self.client.get("/api/products/").data["results"][0]
+        self.assertEqual(full["ingredients"][0]["name"], "Milk")
+
+
+class ProductSearchTests(TestCase):
+    def setUp(self):
+        sorbet = Category.objects.create(name="Sorbet")
+        for name, category, description in (
+            ("Mango Delight", None, "Alphonso pulp"),
+            ("Lemon Chill", sorbet, "Tangy and light"),
+            ("Chocolate Fudge", None, "Rich cocoa with mango swirl"),
+        ):
+            Product.objects.create(
+                name=name,
+                price=Decimal("100.00"),
+                image="products/test.jpg",
+                category=category,
+                description=description,
+                stock=5,
+            )
+
+    def search(self, term, **params):
+        response = self.client.get("/api/products/", {"search": term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row["name"] for row in response.data["results"]]
+
+    @skipUnless(connection.vendor == "postgresql", "ranking needs PostgreSQL full-text search")
+    def test_name_matches_rank_above_description_matches(self):
+        self.assertEqual(self.search("mango"), ["Mango Delight", "Chocolate Fudge"])
+
+    @skipUnless(connection.vendor == "postgresql", "ranking needs PostgreSQL full-text search")
+    def test_category_names_are_searchable(self):
+        self.assertEqual(self.search("sorbet"), ["Lemon Chill"])
+
+    @skipUnless(connection.vendor == "postgresql", "ranking needs PostgreSQL full-text search")
+    def test_explicit_ordering_overrides_relevance(self):
+        self.assertEqual(
+            self.search("mango", ordering="-created_at"), ["Chocolate Fudge", "Mango Delight"]
+        )
+
+    @mock.patch("apps.products.search.search_backend_available", return_value=False)
+    def test_icontains_fallback(self, available):
+        self.assertEqual(sorted(self.search("fudge")), ["Chocolate Fudge"])
+        self.assertEqual(self.search("sorbet"), ["Lemon Chill"])
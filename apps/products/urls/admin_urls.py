@@ -16,6 +16,8 @@ urlpatterns = [
     # PRODUCT
     path("admin/products/", AdminProductListView.as_view()),
     path("admin/products/create/", AdminProductCreateView.as_view()),
+    path("admin/products/import/", AdminProductImportView.as_view()),
+    path("admin/products/bulk-update/", AdminProductBulkUpdateView.as_view()),
     path("admin/products/<slug:slug>/", AdminProductDetailView.as_view()),
     path("admin/products/<slug:slug>/update/", AdminProductUpdateView.as_view()),
     path("admin/products/<slug:slug>/delete/", AdminProductDeleteView.as_view()),
@@ -1,3 +1,9 @@
+import io
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
 from rest_framework.generics import (
     ListAPIView,
     RetrieveAPIView,
@@ -7,7 +13,11 @@ from rest_framework.generics import (
 )
 from rest_framework.permissions import IsAdminUser
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from ..cache import bump_catalog_version
+from ..importers import IMPORT_FORMATS, detect_format, import_products
 from ..models import Product, Category, Ingredient, Allergen, City
 from ..serializers.admin_serializers import (
     AdminProductSerializer,
@@ -15,6 +25,7 @@ from ..serializers.admin_serializers import (
     IngredientSerializer,
     AllergenSerializer,
     CitySerializer,
+    ProductBulkUpdateItemSerializer,
 )
 
 
@@ -100,3 +111,116 @@ class AdminProductDeleteView(DestroyAPIView):
     queryset = Product.objects.all()
     permission_classes = [IsAdminUser]
     lookup_field = "slug"
+
+
+class AdminProductImportView(APIView):
+    """
+    Upsert products from an uploaded CSV or JSON Lines ``file``; returns
+    created/updated counts and the errors of rejected rows.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"detail": "Upload a CSV or JSON Lines file as 'file'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        file_format = request.data.get("format") or detect_format(upload.name)
+        if file_format not in IMPORT_FORMATS:
+            return Response(
+                {"detail": "format must be one of: " + ", ".join(IMPORT_FORMATS)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        try:
+            report = import_products(stream, file_format)
+        except UnicodeDecodeError:
+            return Response(
+                {"detail": "File must be UTF-8 encoded."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(report, status=status.HTTP_200_OK)
+
+
+class AdminProductBulkUpdateView(APIView):
+    """
+    Apply ``[{"id" | "slug", "stock", "price", "is_active"}, ...]`` in one
+    transaction. Rows are locked in primary-key order, like checkout, and
+    written with ``bulk_update``; the response lists only what changed.
+    """
+    permission_classes = [IsAdminUser]
+    max_items = 5000
+
+    def post(self, request):
+        items = request.data.get("items") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Send a non-empty list of items."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.max_items:
+            return Response(
+                {"detail": f"At most {self.max_items} items per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = ProductBulkUpdateItemSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            result = self.apply(serializer.validated_data)
+        if result["updated"]:
+            bump_catalog_version()
+        return Response(result, status=status.HTTP_200_OK)
+
+    def apply(self, rows):
+        ids = {row["id"] for row in rows if "id" in row}
+        slugs = {row["slug"] for row in rows if "slug" in row}
+        products = list(
+            Product.objects
+            .select_for_update()
+            .filter(Q(id__in=ids) | Q(slug__in=slugs))
+            .order_by("pk")
+            .only("id", "slug", *ProductBulkUpdateItemSerializer.UPDATE_FIELDS)
+        )
+        by_id = {product.id: product for product in products}
+        by_slug = {product.slug: product for product in products}
+
+        changes = {}
+        matched = set()
+        not_found = []
+        for row in rows:
+            product = by_id.get(row["id"]) if "id" in row else by_slug.get(row["slug"])
+            if product is None:
+                not_found.append(row.get("id", row.get("slug")))
+                continue
+            matched.add(product.id)
+            for field in ProductBulkUpdateItemSerializer.UPDATE_FIELDS:
+                if field not in row or getattr(product, field) == row[field]:
+                    continue
+                change = changes.setdefault(product.id, {"id": product.id, "slug": product.slug})
+                old = change[field][0] if field in change else getattr(product, field)
+                change[field] = [old, row[field]]
+                setattr(product, field, row[field])
+
+        changed = [by_id[product_id] for product_id in changes]
+        if changed:
+            fields = sorted({
+                field for change in changes.values() for field in change
+                if field in ProductBulkUpdateItemSerializer.UPDATE_FIELDS
+            })
+            now = timezone.now()
+            for product in changed:
+                product.updated_at = now
+            Product.objects.bulk_update(changed, [*fields, "updated_at"], batch_size=500)
+
+        return {
+            "updated": len(changed),
+            "unchanged": len(matched) - len(changed),
+            "not_found": not_found,
+            "changes": list(changes.values()),
+        }
@@ -1,10 +1,14 @@
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
 
 from ..models import Product, Category
 from ..serializers.user_serializers import ProductSerializer, CategorySerializer
+from ..cache import CatalogCacheMixin
+from ..queries import product_queryset_for
+from ..search import ProductSearchFilter, ProductOrderingFilter
+from apps.core.pagination import OptionalKeysetPagination
+from apps.core.sparse import sparse_fields
 
 
 # ================= CATEGORY (USER) =================
@@ -17,35 +21,35 @@ class CategoryListView(ListAPIView):
 # ================= PRODUCT BASE =================
 class ProductBaseQuerysetMixin:
     def get_queryset(self):
-        return (
-            Product.objects
-            .select_related("nutrition", "category")
-            .prefetch_related(
-                "ingredients",
-                "allergens",
-                "available_cities"
-            )
-            .filter(is_active=True)
+        # ?fields= decides which relations are joined and columns loaded
+        return product_queryset_for(
+            Product.objects.filter(is_active=True),
+            sparse_fields(self.request),
         )
 
 
 # ================= PRODUCT LIST =================
-class ProductListView(ProductBaseQuerysetMixin, ListAPIView):
+class ProductListView(CatalogCacheMixin, ProductBaseQuerysetMixin, ListAPIView):
+    cache_prefix = "product-list"
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
+    pagination_class = OptionalKeysetPagination
 
     filter_backends = [
         DjangoFilterBackend,
-        SearchFilter,
-        OrderingFilter,
+        ProductSearchFilter,
+        ProductOrderingFilter,
     ]
 
-    filterset_fields = [
-        "currency",
-        "category__slug",
-        "stock",
-    ]
+    # average_rating__gte=4 -> "4 stars & up", served by the average_rating index
+    filterset_fields = {
+        "currency": ["exact"],
+        "category__slug": ["exact"],
+        "stock": ["exact"],
+        "average_rating": ["gte"],
+    }
 
+    # icontains fallback for databases without full-text search
     search_fields = [
         "name",
         "description",
@@ -65,7 +69,8 @@ class ProductListView(ProductBaseQuerysetMixin, ListAPIView):
 
 
 # ================= PRODUCT DETAIL =================
-class ProductDetailView(ProductBaseQuerysetMixin, RetrieveAPIView):
+class ProductDetailView(CatalogCacheMixin, ProductBaseQuerysetMixin, RetrieveAPIView):
+    cache_prefix = "product-detail"
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
     lookup_field = "slug"
\ No newline at end of file
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import Review
+
+
+def purchases_cache_key(user_id):
+    return f"reviews:purchases:{user_id}"
+
+
+def _load_purchases(user_id):
+    from apps.orders.models import OrderItem
+
+    rows = (
+        OrderItem.objects
+        .filter(order__user_id=user_id)
+        .exclude(order__status="cancelled")
+        .annotate(reviewed=Exists(
+            Review.objects.filter(user_id=user_id, product_id=OuterRef("product_id"))
+        ))
+        .order_by("-order__created_at")
+        .values_list("product_id", "order__status", "order__is_paid", "reviewed")
+    )
+    purchases = {}
+    for product_id, status, is_paid, reviewed in rows:
+        # rows are newest first, so the first status seen is the latest order's
+        entry = purchases.setdefault(product_id, {
+            "status": status,
+            "paid": False,
+            "delivered": False,
+            "delivered_paid": False,
+            "reviewed": reviewed,
+        })
+        entry["paid"] = entry["paid"] or is_paid
+        if status == "delivered":
+            entry["delivered"] = True
+            entry["delivered_paid"] = entry["delivered_paid"] or is_paid
+    return purchases
+
+
+def get_purchases(user_id):
+    """
+    ``{product_id: purchase state}`` for every product in the user's
+    non-cancelled orders, built with one query and cached until one of the
+    user's orders or reviews changes.
+    """
+    key = purchases_cache_key(user_id)
+    purchases = cache.get(key)
+    if purchases is None:
+        purchases = _load_purchases(user_id)
+        cache.set(key, purchases, settings.REVIEW_ELIGIBILITY_CACHE_TIMEOUT)
+    return purchases
+
+
+def invalidate_purchases(*user_ids):
+    keys = [purchases_cache_key(user_id) for user_id in user_ids]
+    # after commit, so a concurrent reader cannot re-cache the old rows
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def review_eligibility(purchases, product_id):
+    entry = purchases.get(product_id)
+    if entry is None:
+        return {
+            "eligible": False,
+            "reason": "NOT_PURCHASED",
+            "detail": "You can only review products that you have purchased."
+        }
+    if not entry["delivered"] and not entry["paid"]:
+        return {
+            "eligible": False,
+            "reason": "NOT_DELIVERED",
+            "detail": f"You can only review products after they are delivered. Current status: {entry['status']}"
+        }
+    if not entry["delivered"]:
+        return {
+            "eligible": False,
+            "reason": "NOT_DELIVERED",
+            "detail": "You can only review products that have been delivered to you."
+        }
+    if entry["reviewed"]:
+        return {
+            "eligible": False,
+            "reason": "ALREADY_REVIEWED",
+            "detail": "You have already reviewed this product."
+        }
+    return {
+        "eligible": True,
+        "detail": "You are eligible to review this product."
+    }
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.reviews.utils import reconcile_ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute product rating sums, counts and averages from active reviews."
+
+    def handle(self, *args, **options):
+        fixed = reconcile_ratings()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled ratings for {fixed} products."))
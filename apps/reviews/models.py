@@ -49,6 +49,19 @@ class Review(models.Model):
         verbose_name_plural = "Reviews"
     def __str__(self):
         return f"{self.user} → {self.product} ({self.rating}⭐)"
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember what the stored row contributes to its product's rating
+        # so the signals can apply a delta instead of recounting
+        if {"product_id", "rating", "is_active"} <= instance.__dict__.keys():
+            instance._stored_contribution = instance.rating_contribution()
+        return instance
+    def rating_contribution(self):
+        """(product_id, rating) counted in the product's stats, or None."""
+        if not self.is_active:
+            return None
+        return (self.product_id, self.rating)
     @property
     def short_comment(self):
         if not self.comment:
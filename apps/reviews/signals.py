@@ -1,10 +1,32 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from apps.orders.models import Order
+from apps.orders.signals import order_status_changed
 from .models import Review
-from .utils import update_product_rating
+from .utils import apply_rating_change, update_product_rating
+from .eligibility import invalidate_purchases
 @receiver(post_save, sender=Review)
-def review_saved(sender, instance, **kwargs):
-    update_product_rating(instance.product)
+def review_saved(sender, instance, created, **kwargs):
+    new = instance.rating_contribution()
+    if created:
+        apply_rating_change(None, new)
+    elif hasattr(instance, "_stored_contribution"):
+        apply_rating_change(instance._stored_contribution, new)
+    else:
+        # instance was not loaded from the database; its old state is unknown
+        update_product_rating(instance.product)
+    instance._stored_contribution = new
+    invalidate_purchases(instance.user_id)
 @receiver(post_delete, sender=Review)
 def review_deleted(sender, instance, **kwargs):
-    update_product_rating(instance.product)
+    old = getattr(instance, "_stored_contribution", instance.rating_contribution())
+    apply_rating_change(old, None)
+    invalidate_purchases(instance.user_id)
+# any order save can change what the user may review (new purchase,
+# payment, delivery, cancellation)
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, **kwargs):
+    invalidate_purchases(instance.user_id)
+@receiver(order_status_changed)
+def order_status_updated(sender, user_ids, **kwargs):
+    invalidate_purchases(*user_ids)
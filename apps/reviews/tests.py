@@ -1,3 +1,163 @@
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.orders.lifecycle import transition_orders
+from apps.orders.models import Order, OrderItem
+from apps.products.models import Product
+from .models import Review
+from .utils import reconcile_ratings
+
+
+def make_product(name="Cone"):
+    return Product.objects.create(
+        name=name,
+        price=Decimal("100.00"),
+        image="products/test.jpg",
+        stock=10,
+    )
+
+
+def make_user(index):
+    return User.objects.create_user(
+        email=f"reviewer{index}@example.com",
+        password="pass12345",
+        name=f"Reviewer {index}",
+    )
+
+
+class RatingSumTests(TestCase):
+    def setUp(self):
+        self.product = make_product()
+
+    def assert_rating(self, rating_sum, review_count, average_rating):
+        self.product.refresh_from_db()
+        self.assertEqual(
+            (self.product.rating_sum, self.product.review_count, self.product.average_rating),
+            (rating_sum, review_count, average_rating),
+        )
+
+    def test_sum_and_average_follow_review_changes(self):
+        first = Review.objects.create(product=self.product, user=make_user(0), rating=5)
+        second = Review.objects.create(product=self.product, user=make_user(1), rating=2)
+        self.assert_rating(7, 2, 3.5)
+
+        first = Review.objects.get(pk=first.pk)
+        first.rating = 3
+        first.save()
+        self.assert_rating(5, 2, 2.5)
+
+        second.delete()
+        self.assert_rating(3, 1, 3.0)
+
+        first.delete()
+        self.assert_rating(0, 0, 0.0)
+
+    def test_reconcile_repairs_drifted_products(self):
+        Review.objects.create(product=self.product, user=make_user(0), rating=4)
+        Product.objects.filter(pk=self.product.pk).update(rating_sum=0, review_count=0, average_rating=0)
+
+        self.assertEqual(reconcile_ratings(), 1)
+        self.assert_rating(4, 1, 4.0)
+        self.assertEqual(reconcile_ratings(), 0)
+
+
+class RatingHistogramTests(TestCase):
+    def setUp(self):
+        self.product = make_product()
+
+    def distribution(self):
+        self.product.refresh_from_db()
+        return self.product.rating_distribution
+
+    def test_histogram_follows_create_edit_deactivate_and_delete(self):
+        review = Review.objects.create(product=self.product, user=make_user(0), rating=5)
+        Review.objects.create(product=self.product, user=make_user(1), rating=5)
+        self.assertEqual(self.distribution(), {"1": 0, "2": 0, "3": 0, "4": 0, "5": 2})
+
+        review = Review.objects.get(pk=review.pk)
+        review.rating = 2
+        review.save()
+        self.assertEqual(self.distribution(), {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1})
+
+        review.is_active = False
+        review.save()
+        self.assertEqual(self.distribution(), {"1": 0, "2": 0, "3": 0, "4": 0, "5": 1})
+        self.assertEqual(self.product.review_count, 1)
+
+        review.is_active = True
+        review.save()
+        self.assertEqual(self.distribution(), {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1})
+
+        review.delete()
+        self.assertEqual(self.distribution(), {"1": 0, "2": 0, "3": 0, "4": 0, "5": 1})
+
+    def test_histogram_is_served_with_the_product(self):
+        Review.objects.create(product=self.product, user=make_user(0), rating=4)
+
+        response = self.client.get(f"/api/products/{self.product.slug}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["rating_distribution"]["4"], 1)
+
+
+class EligibilityCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.product = make_product()
+        self.user = make_user(0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.order = Order.objects.create(
+            user=self.user,
+            total_amount=Decimal("100.00"),
+            status="pending",
+            is_paid=True,
+            full_name="Test Buyer",
+            phone="9876543210",
+            address="1 Test Street",
+            city="Kochi",
+            pincode="682001",
+        )
+        OrderItem.objects.create(order=self.order, product=self.product, quantity=1, price=Decimal("100.00"))
+
+    def eligibility(self):
+        return self.client.get(f"/api/products/{self.product.id}/review-eligibility/").data
+
+    def test_bulk_delivery_and_review_invalidate_the_cache(self):
+        self.assertEqual(self.eligibility()["reason"], "NOT_DELIVERED")
+
+        # invalidation runs on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_orders([self.order.id], "delivered")
+        self.assertTrue(self.eligibility()["eligible"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(product=self.product, user=self.user, rating=5)
+        self.assertEqual(self.eligibility()["reason"], "ALREADY_REVIEWED")
+
+    def test_order_save_invalidates_the_cache(self):
+        self.assertEqual(self.eligibility()["reason"], "NOT_DELIVERED")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.order.status = "delivered"
+            self.order.save()
+
+        self.assertTrue(self.eligibility()["eligible"])
+
+    def test_batch_endpoint_reads_the_cached_purchases(self):
+        self.eligibility()
+        other = make_product("Tub")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                "/api/reviews/eligibility/",
+                {"product_ids": f"{self.product.id},{other.id}"},
+            )
 
-# Create your tests here.
+        results = response.data["results"]
+        self.assertEqual(results[str(self.product.id)]["reason"], "NOT_DELIVERED")
+        self.assertEqual(results[str(other.id)]["reason"], "NOT_PURCHASED")
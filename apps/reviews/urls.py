@@ -1,5 +1,10 @@
 from django.urls import path
-from apps.reviews.views.user_views import ReviewListCreateView, ReviewDetailView, CheckReviewEligibilityView
+from apps.reviews.views.user_views import (
+    ReviewListCreateView,
+    ReviewDetailView,
+    CheckReviewEligibilityView,
+    ReviewEligibilityBatchView,
+)
 urlpatterns = [
     path(
         "products/<int:product_id>/reviews/",
@@ -11,6 +16,11 @@ urlpatterns = [
         CheckReviewEligibilityView.as_view(),
         name="review-eligibility",
     ),
+    path(
+        "reviews/eligibility/",
+        ReviewEligibilityBatchView.as_view(),
+        name="review-eligibility-batch",
+    ),
     path(
         "reviews/<int:pk>/",
         ReviewDetailView.as_view(),
@@ -1,13 +1,114 @@
-from django.db.models import Avg, Count
+from collections import defaultdict
+
+from django.db.models import Count, F, FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from apps.products.models import Product
+from apps.products.cache import bump_catalog_version
 from .models import Review
+
+
+RATING_COUNT_FIELDS = Product.RATING_COUNT_FIELDS
+RATING_FIELDS = ["rating_sum", "review_count", "average_rating", *RATING_COUNT_FIELDS.values()]
+
+
+def average_expression(rating_sum, review_count):
+    return Coalesce(
+        Cast(rating_sum, FloatField()) / NullIf(Cast(review_count, FloatField()), Value(0.0)),
+        Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def apply_rating_change(old, new):
+    """
+    Move a review's contribution from ``old`` to ``new``, each a
+    ``(product_id, rating)`` pair or None, with one F() UPDATE per product.
+    """
+    if old == new:
+        return
+    # product_id -> {field: delta}
+    deltas = defaultdict(lambda: defaultdict(int))
+    for contribution, sign in ((old, -1), (new, 1)):
+        if contribution is None:
+            continue
+        product_id, rating = contribution
+        deltas[product_id]["rating_sum"] += sign * rating
+        deltas[product_id]["review_count"] += sign
+        deltas[product_id][RATING_COUNT_FIELDS[rating]] += sign
+
+    for product_id, fields in deltas.items():
+        changes = {field: F(field) + delta for field, delta in fields.items() if delta}
+        if not changes:
+            continue
+        changes["average_rating"] = average_expression(
+            F("rating_sum") + fields["rating_sum"],
+            F("review_count") + fields["review_count"],
+        )
+        Product.objects.filter(pk=product_id).update(**changes)
+    bump_catalog_version()
+
+
+def rating_stats(histogram):
+    """Derive every rating column from ``{star: count}``."""
+    stats = {
+        field: histogram.get(star, 0)
+        for star, field in RATING_COUNT_FIELDS.items()
+    }
+    stats["review_count"] = sum(histogram.values())
+    stats["rating_sum"] = sum(star * count for star, count in histogram.items())
+    stats["average_rating"] = (
+        stats["rating_sum"] / stats["review_count"] if stats["review_count"] else 0
+    )
+    return stats
+
+
 def update_product_rating(product):
-    stats = Review.objects.filter(
-        product=product,
-        is_active=True
-    ).aggregate(
-        avg_rating=Avg("rating"),
-        total_reviews=Count("id")
-    )
-    product.average_rating = stats["avg_rating"] or 0
-    product.review_count = stats["total_reviews"]
-    product.save(update_fields=["average_rating", "review_count"])
+    """Full recount for one product, for reviews changed outside the ORM signals."""
+    histogram = dict(
+        Review.objects
+        .filter(product=product, is_active=True)
+        .values_list("rating")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    stats = rating_stats(histogram)
+    for field, value in stats.items():
+        setattr(product, field, value)
+    # queryset update skips post_save, so the catalog bump is explicit
+    Product.objects.filter(pk=product.pk).update(**stats)
+    bump_catalog_version()
+
+
+def reconcile_ratings(batch_size=1000):
+    """
+    Recompute every product's rating columns from one grouped query and
+    write back only the rows that drifted. Returns the number fixed.
+    """
+    histograms = defaultdict(dict)
+    rows = (
+        Review.objects
+        .filter(is_active=True)
+        .values_list("product_id", "rating")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for product_id, rating, count in rows:
+        histograms[product_id][rating] = count
+
+    changed = []
+    products = Product.objects.only("id", *RATING_FIELDS)
+    for product in products.iterator(chunk_size=2000):
+        stats = rating_stats(histograms.get(product.id, {}))
+        drifted = any(
+            abs(getattr(product, field) - value) > 1e-9
+            for field, value in stats.items()
+        )
+        if drifted:
+            for field, value in stats.items():
+                setattr(product, field, value)
+            changed.append(product)
+
+    Product.objects.bulk_update(changed, RATING_FIELDS, batch_size=batch_size)
+    if changed:
+        bump_catalog_version()
+    return len(changed)
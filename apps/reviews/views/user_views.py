@@ -1,8 +1,8 @@
-from django.db import models
 from rest_framework.response import Response
-from rest_framework import generics, permissions, serializers
+from rest_framework import generics, permissions, serializers, status
 from ..models import Review
 from ..serializers import ReviewSerializer
+from ..eligibility import get_purchases, review_eligibility
 
 class ReviewListCreateView(generics.ListCreateAPIView):
     serializer_class = ReviewSerializer
@@ -22,23 +22,13 @@ class ReviewListCreateView(generics.ListCreateAPIView):
         product_id = self.kwargs["product_id"]
 
         # Check if user has purchased the product
-        from apps.orders.models import Order
-        has_purchased = Order.objects.filter(
-            user=user,
-            items__product_id=product_id,
-            is_paid=True,
-            status="delivered"
-        ).exists()
-
-        if not has_purchased:
+        purchase = get_purchases(user.id).get(product_id)
+        if not purchase or not purchase["delivered_paid"]:
              raise serializers.ValidationError(
                 {"detail": "You can only review products that have been delivered to you."}
             )
 
-        if Review.objects.filter(
-            user=user,
-            product_id=product_id
-        ).exists():
+        if purchase["reviewed"]:
             raise serializers.ValidationError(
                 {"detail": "You have already reviewed this product."}
             )
@@ -62,60 +52,42 @@ class CheckReviewEligibilityView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, product_id):
-        user = request.user
-        from apps.orders.models import Order
-        
-        # 1. Total purchased check (Any non-cancelled order with this product)
-        all_product_orders = Order.objects.filter(
-            user=user,
-            items__product_id=product_id
-        ).exclude(status="cancelled")
-
-        if not all_product_orders.exists():
-            return Response({
-                "eligible": False,
-                "reason": "NOT_PURCHASED",
-                "detail": "You can only review products that you have purchased."
-            })
-
-        # 2. Eligibility is granted if ANY such order is "delivered" OR "is_paid"
-        eligible_orders = all_product_orders.filter(
-            models.Q(status="delivered") | models.Q(is_paid=True)
-        )
+        purchases = get_purchases(request.user.id)
+        return Response(review_eligibility(purchases, product_id))
 
-        if not eligible_orders.exists():
-            # If we have an order but it's not paid/delivered yet
-            current_status = all_product_orders.first().status
-            return Response({
-                "eligible": False,
-                "reason": "NOT_DELIVERED",
-                "detail": f"You can only review products after they are delivered. Current status: {current_status}"
-            })
-            
-        # 3. If it's paid but user wants it only when delivered (as per instruction)
-        # Let's check if there's a delivered one.
-        delivered_orders = all_product_orders.filter(status="delivered")
-        if not delivered_orders.exists():
-             return Response({
-                "eligible": False,
-                "reason": "NOT_DELIVERED",
-                "detail": "You can only review products that have been delivered to you."
-            })
 
-        # 4. Check if already reviewed
-        already_reviewed = Review.objects.filter(
-            user=user,
-            product_id=product_id
-        ).exists()
+class ReviewEligibilityBatchView(generics.GenericAPIView):
+    """
+    Eligibility for many products at once:
+    ``?product_ids=1,2,3`` -> ``{"results": {"1": {...}, ...}}``.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_products = 100
 
-        if already_reviewed:
-            return Response({
-                "eligible": False,
-                "reason": "ALREADY_REVIEWED",
-                "detail": "You have already reviewed this product."
-            })
+    def get(self, request):
+        raw = request.query_params.get("product_ids", "")
+        try:
+            product_ids = [int(value) for value in raw.split(",") if value.strip()]
+        except ValueError:
+            return Response(
+                {"detail": "product_ids must be a comma-separated list of integers."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not product_ids:
+            return Response(
+                {"detail": "product_ids is required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(product_ids) > self.max_products:
+            return Response(
+                {"detail": f"At most {self.max_products} product_ids per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
+        purchases = get_purchases(request.user.id)
         return Response({
-            "eligible": True,
-            "detail": "You are eligible to review this product."
+            "results": {
+                str(product_id): review_eligibility(purchases, product_id)
+                for product_id in product_ids
+            }
         })
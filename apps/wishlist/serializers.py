@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from apps.core.sparse import SparseFieldsetMixin
 from .models import WishlistItem
 from apps.products.models import Product
-from apps.products.serializers.user_serializers import ProductSerializer
-class WishlistSerializer(serializers.ModelSerializer):
-    product = ProductSerializer(read_only=True)
+from apps.products.serializers.user_serializers import ProductCardSerializer
+class WishlistSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    product = ProductCardSerializer(read_only=True)
     product_id = serializers.PrimaryKeyRelatedField(
         queryset=Product.objects.all(),
         source="product",
@@ -1,3 +1,30 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.cart.tests import make_catalog
+from .models import WishlistItem
+
+
+class WishlistListQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="wish@example.com", password="pass12345", name="Wish User"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def wishlist_queries(self, count):
+        WishlistItem.objects.filter(user=self.user).delete()
+        for product in make_catalog(count):
+            WishlistItem.objects.create(user=self.user, product=product)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/wishlist/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], count)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_wishlist_size(self):
+        self.assertEqual(self.wishlist_queries(1), self.wishlist_queries(8))
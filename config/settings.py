@@ -108,6 +108,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     "corsheaders",
     "rest_framework",
@@ -120,6 +121,7 @@ INSTALLED_APPS = [
     "apps.reviews.apps.ReviewsConfig",
     "apps.orders.apps.OrdersConfig",
     "apps.payments.apps.PaymentsConfig",
+    "apps.core.apps.CoreConfig",
 ]
 
 
@@ -175,12 +177,70 @@ DATABASES = {
 }
 
 
+# =====================
+# CACHE
+# =====================
+# Use a shared backend (Redis/Memcached) in production so catalog
+# version bumps reach every worker process.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    },
+    # guest carts are the only copy of the cart, so they get a store of
+    # their own that every worker shares and catalog entries cannot cull;
+    # the database default needs `manage.py createcachetable`
+    "carts": {
+        "BACKEND": os.getenv(
+            "CART_CACHE_BACKEND",
+            "django.core.cache.backends.db.DatabaseCache",
+        ),
+        "LOCATION": os.getenv("CART_CACHE_LOCATION", "guest_cart_cache"),
+    },
+}
+if CACHES["carts"]["BACKEND"] == "django.core.cache.backends.db.DatabaseCache":
+    CACHES["carts"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.getenv("CART_CACHE_MAX_ENTRIES", 1_000_000)),
+    }
+
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", 300))
+REVIEW_ELIGIBILITY_CACHE_TIMEOUT = 60 * 60
+# how long a worker trusts its cached token_version; with the per-process
+# LocMemCache, revocation reaches other workers within this window
+TOKEN_VERSION_CACHE_TIMEOUT = int(os.getenv("TOKEN_VERSION_CACHE_TIMEOUT", 30))
+
+
+# most units of one product a cart line may hold
+CART_MAX_QUANTITY = 99
+
+
+# =====================
+# GUEST CART
+# =====================
+# anonymous carts live only in the cache, keyed by a signed cookie
+GUEST_CART_CACHE = "carts"
+GUEST_CART_TTL = timedelta(days=7)
+GUEST_CART_MAX_LINES = 50
+GUEST_CART_MAX_QUANTITY = CART_MAX_QUANTITY
+
+
+# =====================
+# IDEMPOTENCY
+# =====================
+# purge with `manage.py purge_idempotency_keys`
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+
 # =====================
 # REST FRAMEWORK
 # =====================
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # builds request.user from token claims; see apps/accounts/authentication.py
+        "apps.accounts.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",  # Change per-view if needed
@@ -216,8 +276,22 @@ SIMPLE_JWT.update({
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
-MEDIA_URL = "/media/"
+MEDIA_URL = os.getenv("MEDIA_URL", "/media/")
 MEDIA_ROOT = BASE_DIR / "media"
+SERVE_MEDIA = os.getenv("SERVE_MEDIA", str(DEBUG)).lower() in ("true", "1", "yes")
+
+# uploads are named by content hash and never change; see apps/core/storage.py
+STORAGES = {
+    "default": {
+        "BACKEND": "apps.core.storage.ContentHashedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# background threads building thumb/card/detail copies of uploads
+IMAGE_RENDITION_WORKERS = int(os.getenv("IMAGE_RENDITION_WORKERS", 2))
 
 
 # =====================
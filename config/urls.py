@@ -1,7 +1,7 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
+from apps.core.views import serve_media
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -32,4 +32,8 @@ urlpatterns = [
     path("api/", include("apps.reviews.urls")),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# in production put the same Cache-Control headers on the web server / CDN
+if settings.SERVE_MEDIA and settings.MEDIA_URL.startswith("/"):
+    urlpatterns += [
+        re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.*)$", serve_media),
+    ]